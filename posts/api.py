@@ -0,0 +1,311 @@
+import base64
+import binascii
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import bulk, timeline
+from .models import Comment, Group, Post
+from .pagination import CursorPaginator
+
+
+class ApiError(Exception):
+    status = 400
+
+
+class NotAuthenticated(ApiError):
+    status = 401
+
+    def __init__(self, message='Нужна авторизация'):
+        super().__init__(message)
+
+
+class PermissionDenied(ApiError):
+    status = 403
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def api_view(*methods):
+    """Ошибки API отдаются JSON, а не HTML-страницами."""
+    def decorator(view):
+        @require_http_methods(methods)
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                return view(request, *args, **kwargs)
+            except Http404:
+                return json_response({'detail': 'Не найдено'}, status=404)
+            except ApiError as error:
+                return json_response(
+                    {'detail': str(error)}, status=error.status
+                )
+        return wrapper
+    return decorator
+
+
+def api_user(request):
+    """
+    Пользователь API: по HTTP Basic (для скриптов партнёров, без CSRF)
+    или по сессии сайта, и тогда с обычной проверкой CSRF.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Basic '):
+        try:
+            credentials = base64.b64decode(header[6:]).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise NotAuthenticated('Неверный заголовок Authorization')
+        username, _, password = credentials.partition(':')
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            raise NotAuthenticated('Неверный логин или пароль')
+        return user
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+    if CsrfViewMiddleware().process_view(request, None, (), {}):
+        raise PermissionDenied('Ошибка проверки CSRF')
+    return request.user
+
+
+def batch_items(request):
+    try:
+        items = json.loads(request.body)
+    except ValueError:
+        raise ApiError('Тело запроса должно быть JSON')
+    if not isinstance(items, list) or not items:
+        raise ApiError('Ожидается непустой массив объектов')
+    if len(items) > settings.API_MAX_BATCH:
+        raise ApiError(f'Не больше {settings.API_MAX_BATCH} объектов за раз')
+    return items
+
+
+def _user(user):
+    return {
+        'id': user.pk,
+        'username': user.username,
+        'full_name': user.get_full_name(),
+    }
+
+
+def _group(group):
+    if group is None:
+        return None
+    return {'id': group.pk, 'slug': group.slug, 'title': group.title}
+
+
+USER_COLUMNS = ('username', 'first_name', 'last_name')
+
+
+class Resource:
+    """
+    Как модель отдаётся в API: поле ответа -> (колонки, функция).
+    Из базы читаются только колонки запрошенных полей, связанные
+    объекты подтягиваются select_related; ответ собирается из
+    атрибутов напрямую, без форм и django.core.serializers.
+    """
+
+    def __init__(self, queryset, fields, ordering):
+        self.queryset = queryset
+        self.fields = fields
+        self.ordering = ordering
+
+    def names(self, request):
+        requested = request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f'Неизвестные поля: {", ".join(unknown)}')
+        return names
+
+    def select(self, names, queryset=None, ordering=None):
+        queryset = self.queryset if queryset is None else queryset
+        # Поля сортировки тоже нужны курсору; аннотации и так в выборке.
+        columns = {
+            name.lstrip('-') for name in ordering or self.ordering
+        } - {'pk'} - set(queryset.query.annotations)
+        for name in names:
+            columns.update(self.fields[name][0])
+        related = {column.split('__')[0] for column in columns if '__' in column}
+        # select_related() без аргументов тянет все внешние ключи.
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only('pk', *columns)
+
+    def serialize(self, obj, names):
+        return {name: self.fields[name][1](obj) for name in names}
+
+    def detail(self, request, **lookup):
+        names = self.names(request)
+        obj = get_object_or_404(self.select(names), **lookup)
+        return json_response(self.serialize(obj, names))
+
+    def page(self, request, queryset=None, ordering=None):
+        names = self.names(request)
+        try:
+            limit = int(request.GET.get('limit', settings.API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError('limit должен быть числом')
+        limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+        ordering = ordering or self.ordering
+        paginator = CursorPaginator(
+            self.select(names, queryset, ordering), limit, ordering=ordering
+        )
+        page = paginator.get_page(request.GET.get('cursor'))
+        return json_response({
+            'results': [self.serialize(obj, names) for obj in page],
+            'next': _page_url(request, page.next_cursor()),
+            'previous': _page_url(request, page.previous_cursor()),
+        })
+
+
+def _page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return f'{request.path}?{query.urlencode()}'
+
+
+POSTS = Resource(
+    Post.objects.all(),
+    {
+        'id': ((), lambda post: post.pk),
+        'title': (('title',), lambda post: post.title),
+        'text': (('text',), lambda post: post.text),
+        'pub_date': (('pub_date',), lambda post: post.pub_date),
+        'image': (
+            ('image',),
+            lambda post: post.image.url if post.image else None,
+        ),
+        'thumbnail': (
+            ('thumbnail_url',), lambda post: post.thumbnail_url or None,
+        ),
+        'author': (
+            tuple(f'author__{column}' for column in USER_COLUMNS),
+            lambda post: _user(post.author),
+        ),
+        'group': (
+            ('group__slug', 'group__title'), lambda post: _group(post.group),
+        ),
+        'comment_count': (
+            ('comment_count',), lambda post: post.comment_count,
+        ),
+    },
+    ordering=('-pub_date', '-pk'),
+)
+GROUPS = Resource(
+    Group.objects.all(),
+    {
+        'id': ((), lambda group: group.pk),
+        'slug': (('slug',), lambda group: group.slug),
+        'title': (('title',), lambda group: group.title),
+        'description': (('description',), lambda group: group.description),
+    },
+    ordering=('pk',),
+)
+COMMENTS = Resource(
+    Comment.objects.all(),
+    {
+        'id': ((), lambda comment: comment.pk),
+        'post': (('post_id',), lambda comment: comment.post_id),
+        'author': (
+            tuple(f'author__{column}' for column in USER_COLUMNS),
+            lambda comment: _user(comment.author),
+        ),
+        'text': (('text',), lambda comment: comment.text),
+        'created': (('created',), lambda comment: comment.created),
+    },
+    ordering=('-created', '-pk'),
+)
+
+
+@api_view('GET')
+def post_list(request):
+    queryset = POSTS.queryset
+    if request.GET.get('group'):
+        queryset = queryset.filter(group__slug=request.GET['group'])
+    if request.GET.get('author'):
+        queryset = queryset.filter(author__username=request.GET['author'])
+    return POSTS.page(request, queryset)
+
+
+@api_view('GET')
+def post_detail(request, post_id):
+    return POSTS.detail(request, pk=post_id)
+
+
+@api_view('GET')
+def group_list(request):
+    return GROUPS.page(request)
+
+
+@api_view('GET')
+def group_detail(request, slug):
+    return GROUPS.detail(request, slug=slug)
+
+
+@api_view('GET')
+def comment_list(request, post_id):
+    get_object_or_404(Post.objects.only('pk'), pk=post_id)
+    return COMMENTS.page(request, COMMENTS.queryset.filter(post_id=post_id))
+
+
+@api_view('GET')
+def comment_detail(request, comment_id):
+    return COMMENTS.detail(request, pk=comment_id)
+
+
+@api_view('GET')
+def follow_feed(request):
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+    return POSTS.page(
+        request, timeline.feed(request.user.id), ordering=timeline.ORDERING
+    )
+
+
+def _created(resource, objs):
+    names = list(resource.fields)
+    rows = resource.select(names).filter(
+        pk__in=[obj.pk for obj in objs]
+    ).order_by('pk')
+    return json_response(
+        {'results': [resource.serialize(obj, names) for obj in rows]},
+        status=201,
+    )
+
+
+@csrf_exempt
+@api_view('POST')
+def post_batch(request):
+    user = api_user(request)
+    try:
+        posts = bulk.create_posts(user, batch_items(request))
+    except bulk.BatchError as error:
+        return json_response({'errors': error.errors}, status=400)
+    return _created(POSTS, posts)
+
+
+@csrf_exempt
+@api_view('POST')
+def comment_batch(request):
+    user = api_user(request)
+    try:
+        comments = bulk.create_comments(user, batch_items(request))
+    except bulk.BatchError as error:
+        return json_response({'errors': error.errors}, status=400)
+    return _created(COMMENTS, comments)
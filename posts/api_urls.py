@@ -0,0 +1,23 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', api.post_list, name='post_list'),
+    path('posts/batch/', api.post_batch, name='post_batch'),
+    path('posts/<int:post_id>/', api.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/', api.comment_list,
+        name='comment_list',
+    ),
+    path('comments/batch/', api.comment_batch, name='comment_batch'),
+    path(
+        'comments/<int:comment_id>/', api.comment_detail,
+        name='comment_detail',
+    ),
+    path('groups/', api.group_list, name='group_list'),
+    path('groups/<slug:slug>/', api.group_detail, name='group_detail'),
+    path('follow/', api.follow_feed, name='follow_feed'),
+]
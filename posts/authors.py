@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .models import Follow, User
+from .replicas import reading_replica
+from .stats import get_stats
+
+
+def _id_key(username):
+    return f'author-id:{username}'
+
+
+def _context_key(author_id):
+    return f'author-context:{author_id}'
+
+
+def _following_key(author_id, user_id):
+    return f'author-context:{author_id}:follower:{user_id}'
+
+
+def load_author(request, username):
+    """
+    Автор и его счётчики для profile и post_view: profile, post_count,
+    followers, follows и following (подписан ли зритель). Запоминается
+    на время запроса, а между запросами живёт в кэше по id автора
+    AUTHOR_CONTEXT_TIMEOUT секунд. None, если автора нет.
+    """
+    memo = request.__dict__.setdefault('_authors', {})
+    if username not in memo:
+        memo[username] = _load(request, username)
+    return memo[username]
+
+
+def get_author_or_404(request, username):
+    author = load_author(request, username)
+    if author is None:
+        raise Http404
+    return author
+
+
+def author_context(request, author):
+    """Как load_author, но для уже загруженного пользователя author."""
+    memo = request.__dict__.setdefault('_authors', {})
+    if author.username not in memo:
+        values = _cached(author.pk, author.username)
+        if values is None:
+            values = _store(author, get_stats(author.pk))
+        memo[author.username] = _context(request, values, author)
+    return memo[author.username]
+
+
+def _cached(author_id, username):
+    values = cache.get(_context_key(author_id))
+    # Имя могло смениться: тогда id в кэше указывает не туда.
+    if values is not None and values['username'] != username:
+        return None
+    return values
+
+
+def _load(request, username):
+    values = None
+    author_id = cache.get(_id_key(username))
+    if author_id is not None:
+        values = _cached(author_id, username)
+    if values is None:
+        author = User.objects.select_related('stats').filter(
+            username=username
+        ).first()
+        if author is None:
+            return None
+        values = _store(author, getattr(author, 'stats', None))
+    return _context(request, values)
+
+
+def _store(author, stats):
+    """
+    Кладёт в кэш только простые значения: объект User с хэшем пароля
+    в общий кэш не попадает. Прочитанное с реплики не кэшируется.
+    """
+    values = {
+        'pk': author.pk,
+        'username': author.username,
+        'first_name': author.first_name,
+        'last_name': author.last_name,
+        'post_count': stats.post_count if stats else 0,
+        'followers': stats.followers_count if stats else 0,
+        'follows': stats.following_count if stats else 0,
+    }
+    if not reading_replica():
+        cache.set_many({
+            _id_key(author.username): author.pk,
+            _context_key(author.pk): values,
+        }, settings.AUTHOR_CONTEXT_TIMEOUT)
+    return values
+
+
+def _context(request, values, author=None):
+    if author is None:
+        author = User(
+            pk=values['pk'],
+            username=values['username'],
+            first_name=values['first_name'],
+            last_name=values['last_name'],
+        )
+    return {
+        'profile': author,
+        'post_count': values['post_count'],
+        'followers': values['followers'],
+        'follows': values['follows'],
+        'following': _following(request, author),
+    }
+
+
+def _following(request, author):
+    viewer = request.user
+    if not viewer.is_authenticated or viewer.pk == author.pk:
+        return False
+    key = _following_key(author.pk, viewer.pk)
+    following = cache.get(key)
+    if following is None:
+        following = Follow.objects.filter(user=viewer, author=author).exists()
+        if not reading_replica():
+            cache.set(key, following, settings.AUTHOR_CONTEXT_TIMEOUT)
+    return following
+
+
+def invalidate(author_id, follower_id=None, username=None):
+    keys = [_context_key(author_id)]
+    if follower_id is not None:
+        keys.append(_following_key(author_id, follower_id))
+    if username is not None:
+        keys.append(_id_key(username))
+    cache.delete_many(keys)
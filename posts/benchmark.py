@@ -0,0 +1,234 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from . import feed_cache, search, stats, thumbnails, timeline, trending
+from .models import Comment, Follow, Group, Post, User
+from .utils import percentile
+
+
+# Маршруты, которым нужен не анонимный GET.
+SCENARIOS = {
+    'new': {'login': 'reader'},
+    'follow_index': {'login': 'reader'},
+    'post_edit': {'login': 'author'},
+    'add_comment': {
+        'login': 'reader', 'method': 'post', 'data': {'text': 'bench'},
+    },
+    'profile_follow': {'login': 'reader'},
+    'profile_unfollow': {'login': 'reader'},
+    'profile_subscription': {'login': 'reader', 'method': 'post'},
+    'search': {'query': {'q': 'пост текст'}},
+}
+WORDS = (
+    'пост', 'текст', 'кошка', 'собака', 'город', 'новости', 'день',
+    'погода', 'книга', 'музыка', 'python', 'django',
+)
+
+
+def _image(seed):
+    buffer = BytesIO()
+    color = (seed * 37 % 256, seed * 59 % 256, seed * 83 % 256)
+    Image.new('RGB', (1200, 800), color).save(buffer, 'jpeg')
+    return ContentFile(buffer.getvalue())
+
+
+def seed(users=50, posts=1000, follow_density=0.1, comments=2, images=0,
+         groups=5, random_seed=0):
+    """
+    Заполняет базу синтетическими данными через bulk_create и пересобирает
+    производные данные (счётчики, ленты, поисковый индекс).
+    """
+    rng = random.Random(random_seed)
+    User.objects.bulk_create(
+        User(username=f'bench_{i}') for i in range(users)
+    )
+    user_ids = list(User.objects.filter(
+        username__startswith='bench_'
+    ).values_list('pk', flat=True))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'bench-{i}', description='bench')
+        for i in range(groups)
+    )
+    group_ids = list(Group.objects.filter(
+        slug__startswith='bench-'
+    ).values_list('pk', flat=True))
+    Post.objects.bulk_create(
+        (
+            Post(
+                text=' '.join(rng.choice(WORDS) for _ in range(20)),
+                author_id=rng.choice(user_ids),
+                group_id=rng.choice(group_ids + [None]),
+            )
+            for _ in range(posts)
+        ),
+        batch_size=500,
+    )
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                post_id=rng.choice(post_ids),
+                author_id=rng.choice(user_ids),
+                text='комментарий',
+            )
+            for _ in range(comments * posts)
+        ),
+        batch_size=500,
+    )
+    per_user = max(0, min(users - 1, round(follow_density * (users - 1))))
+    Follow.objects.bulk_create(
+        (
+            Follow(user_id=user_id, author_id=author_id)
+            for user_id in user_ids
+            for author_id in rng.sample(
+                [other for other in user_ids if other != user_id], per_user
+            )
+        ),
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    for post_id in rng.sample(post_ids, min(images, len(post_ids))):
+        post = Post.objects.get(pk=post_id)
+        post.image.save(f'bench_{post_id}.jpg', _image(post_id), save=False)
+        Post.objects.filter(pk=post_id).update(image=post.image.name)
+        thumbnails.generate(post_id)
+    stats.reconcile()
+    stats.recount_comments()
+    trending.rebuild()
+    timeline.rebuild()
+    for post in Post.objects.only('pk', 'title', 'text').iterator():
+        search.index_post(post)
+    feed_cache.bump_generation()
+
+
+def sample_objects():
+    reader = (
+        User.objects.filter(username__startswith='bench_')
+        .order_by('-stats__following_count').first()
+    )
+    post = Post.objects.select_related('author').order_by('-pub_date').first()
+    target = (
+        User.objects.filter(username__startswith='bench_')
+        .exclude(pk__in=[reader.pk, post.author_id]).first()
+    )
+    return {
+        'reader': reader,
+        'author': post.author,
+        'post': post,
+        'target': target,
+        'group': Group.objects.first(),
+    }
+
+
+def route_patterns():
+    from posts.urls import urlpatterns as posts_urls
+    from users.urls import urlpatterns as users_urls
+    return [pattern for pattern in [*posts_urls, *users_urls] if pattern.name]
+
+
+def build_request(pattern, objects):
+    converters = pattern.pattern.converters
+    kwargs = {}
+    if 'username' in converters:
+        if pattern.name in ('profile_follow', 'profile_unfollow',
+                            'profile_subscription'):
+            kwargs['username'] = objects['target'].username
+        else:
+            kwargs['username'] = objects['author'].username
+    if 'post_id' in converters:
+        kwargs['post_id'] = objects['post'].pk
+    if 'slug' in converters:
+        kwargs['slug'] = objects['group'].slug
+    scenario = SCENARIOS.get(pattern.name, {})
+    return reverse(pattern.name, kwargs=kwargs), scenario
+
+
+def measure(client, method, url, data):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = getattr(client, method)(url, data)
+        elapsed = (time.perf_counter() - started) * 1000
+    if hasattr(response, 'streaming_content'):
+        b''.join(response.streaming_content)
+    return response.status_code, elapsed, len(queries)
+
+
+def run(requests=20, warmup=2, routes=None):
+    """Прогоняет маршруты через тестовый клиент и собирает метрики."""
+    objects = sample_objects()
+    clients = {None: Client()}
+    for role in ('reader', 'author'):
+        clients[role] = Client()
+        clients[role].force_login(objects[role])
+    results = {}
+    for pattern in route_patterns():
+        if routes and pattern.name not in routes:
+            continue
+        url, scenario = build_request(pattern, objects)
+        client = clients[scenario.get('login')]
+        method = scenario.get('method', 'get')
+        data = scenario.get('data') or scenario.get('query') or {}
+        for _ in range(warmup):
+            measure(client, method, url, data)
+        timings, query_counts, statuses = [], [], set()
+        for _ in range(requests):
+            status, elapsed, queries = measure(client, method, url, data)
+            timings.append(elapsed)
+            query_counts.append(queries)
+            statuses.add(status)
+        tracemalloc.start()
+        try:
+            measure(client, method, url, data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results[pattern.name] = {
+            'url': url,
+            'method': method.upper(),
+            'status': sorted(statuses),
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'queries': max(query_counts),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+    return results
+
+
+def compare(current, baseline, tolerance=0.2):
+    """Список регрессий относительно сохранённого прогона."""
+    regressions = []
+    for name, now in current['routes'].items():
+        before = baseline.get('routes', {}).get(name)
+        if before is None:
+            continue
+        if now['queries'] > before['queries']:
+            regressions.append(
+                f'{name}: запросов {before["queries"]} -> {now["queries"]}'
+            )
+        for metric in ('p95_ms', 'peak_memory_kb'):
+            if now[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {metric} {before[metric]} -> {now[metric]}'
+                )
+    return regressions
+
+
+def dump(result, path):
+    with open(path, 'w', encoding='utf-8') as stream:
+        json.dump(result, stream, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as stream:
+        return json.load(stream)
@@ -0,0 +1,393 @@
+import csv
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import authors, feed_cache, search, stats, timeline, trending
+from .forms import CommentForm, PostForm
+from .models import Comment, Follow, Group, Post, User
+
+
+# Поля выгрузки: имя в файле -> поле/лукап в ORM.
+SPECS = {
+    'group': (Group, {
+        'id': 'id',
+        'title': 'title',
+        'slug': 'slug',
+        'description': 'description',
+    }),
+    'post': (Post, {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author__username',
+        'group': 'group__slug',
+        'image': 'image',
+    }),
+    'comment': (Comment, {
+        'id': 'id',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created': 'created',
+    }),
+    'follow': (Follow, {
+        'user': 'user__username',
+        'author': 'author__username',
+    }),
+}
+FORMATS = ('jsonl', 'csv')
+DATE_FIELDS = {'pub_date', 'created'}
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+def export_rows(model_name, chunk_size=2000):
+    model, fields = SPECS[model_name]
+    names = list(fields)
+    rows = model.objects.order_by('pk').values_list(*fields.values())
+    for values in rows.iterator(chunk_size=chunk_size):
+        row = dict(zip(names, values))
+        for name in DATE_FIELDS & row.keys():
+            if row[name] is not None:
+                row[name] = row[name].isoformat()
+        yield row
+
+
+def write_rows(rows, stream, fmt, model_name):
+    names = list(SPECS[model_name][1])
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=names)
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(row):
+            stream.write(json.dumps(row, ensure_ascii=False))
+            stream.write('\n')
+    count = 0
+    for row in rows:
+        write(row)
+        count += 1
+    return count
+
+
+def read_rows(stream, fmt):
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            yield {key: (value if value != '' else None)
+                   for key, value in row.items()}
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Importer.build отклонит строку как не объект.
+                yield None
+
+
+@contextmanager
+def explicit_dates(model):
+    """Отключает auto_now_add, чтобы сохранить даты из файла."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class RowError(ValueError):
+    """Строку импорта нельзя загрузить; текст — причина пропуска."""
+
+
+def _text(row, name, required=True):
+    value = row.get(name)
+    if value is None or value == '':
+        if required:
+            raise RowError(f'Нет поля {name}')
+        return None
+    if not isinstance(value, str):
+        raise RowError(f'{name}: ожидается строка')
+    return value
+
+
+def _int(row, name, required=False):
+    value = row.get(name)
+    if value is None or value == '':
+        if required:
+            raise RowError(f'Нет поля {name}')
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+    elif _is_id(value):
+        return value
+    raise RowError(f'{name}: ожидается число')
+
+
+def _date(row, name):
+    value = row.get(name)
+    if not value:
+        return timezone.now()
+    try:
+        date = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        date = None
+    if date is None:
+        raise RowError(f'{name}: неверная дата')
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date, timezone.utc)
+    return date
+
+
+def _lookup(ids, row, name):
+    value = row.get(name)
+    return ids.get(value) if isinstance(value, str) else None
+
+
+def _user_id(users, row, name):
+    user_id = _lookup(users, row, name)
+    if user_id is None:
+        raise RowError(f'{name}: неизвестный пользователь')
+    return user_id
+
+
+class Importer:
+    """
+    Потоковый импорт пачками через bulk_create. Авторы и группы
+    разрешаются через словари в памяти. Строки с неизвестными ссылками
+    или неверными полями пропускаются: skipped — их число, problems —
+    причина -> [сколько раз, номер первой такой строки].
+    """
+
+    def __init__(self, model_name, batch_size=1000, progress=None):
+        self.model_name = model_name
+        self.model = SPECS[model_name][0]
+        self.batch_size = batch_size
+        self.progress = progress
+        self.attempted = 0
+        self.written = 0
+        self.skipped = 0
+        self.problems = {}
+        self.started = None
+        self.users = dict(
+            User.objects.values_list('username', 'id').iterator()
+        )
+        self.groups = dict(Group.objects.values_list('slug', 'id').iterator())
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return (self.attempted + self.skipped) / elapsed if elapsed else 0.0
+
+    @property
+    def existing(self):
+        """Строки, которые ignore_conflicts пропустил как уже имеющиеся."""
+        return self.attempted - self.written
+
+    def skip(self, number, reason):
+        self.skipped += 1
+        problem = self.problems.setdefault(reason, [0, number])
+        problem[0] += 1
+
+    def build(self, row):
+        """Объект модели из строки файла; RowError, если строка неверна."""
+        if not isinstance(row, dict):
+            raise RowError('Ожидается объект JSON')
+        if self.model_name == 'group':
+            return Group(
+                id=_int(row, 'id'),
+                title=_text(row, 'title', required=False),
+                slug=_text(row, 'slug'),
+                description=_text(row, 'description', required=False) or '',
+            )
+        if self.model_name == 'post':
+            return Post(
+                id=_int(row, 'id'),
+                title=_text(row, 'title', required=False),
+                text=_text(row, 'text'),
+                pub_date=_date(row, 'pub_date'),
+                author_id=_user_id(self.users, row, 'author'),
+                group_id=_lookup(self.groups, row, 'group'),
+                image=_text(row, 'image', required=False),
+            )
+        if self.model_name == 'comment':
+            return Comment(
+                id=_int(row, 'id'),
+                post_id=_int(row, 'post', required=True),
+                author_id=_user_id(self.users, row, 'author'),
+                text=_text(row, 'text'),
+                created=_date(row, 'created'),
+            )
+        user_id = _user_id(self.users, row, 'user')
+        author_id = _user_id(self.users, row, 'author')
+        if user_id == author_id:
+            raise RowError('Подписка на себя')
+        return Follow(user_id=user_id, author_id=author_id)
+
+    def flush(self, batch):
+        if self.model is Comment:
+            known = set(Post.objects.filter(
+                pk__in={comment.post_id for _, comment in batch}
+            ).values_list('pk', flat=True))
+            for number, comment in batch:
+                if comment.post_id not in known:
+                    self.skip(number, 'post: запись не найдена')
+            batch = [item for item in batch if item[1].post_id in known]
+        batch = [obj for _, obj in batch]
+        self.model.objects.bulk_create(batch, ignore_conflicts=True)
+        self.attempted += len(batch)
+        if self.progress:
+            self.progress(self)
+
+    def run(self, rows):
+        """
+        bulk_create с ignore_conflicts не сообщает, сколько строк вставлено,
+        поэтому written считается по числу строк таблицы до и после.
+        Строки нумеруются с 1 в порядке файла, без заголовка CSV.
+        """
+        self.started = time.monotonic()
+        before = self.model.objects.count()
+        batch = []
+        with explicit_dates(self.model):
+            for number, row in enumerate(rows, 1):
+                try:
+                    obj = self.build(row)
+                except RowError as error:
+                    self.skip(number, str(error))
+                    continue
+                batch.append((number, obj))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            if batch:
+                self.flush(batch)
+        self.written = self.model.objects.count() - before
+        return self
+
+
+class BatchError(Exception):
+    """Ошибки валидации пачки: [{'index': ..., 'errors': {...}}]."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+NOT_AN_OBJECT = {'__all__': ['Ожидается объект']}
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _form_errors(form):
+    return {field: list(errors) for field, errors in form.errors.items()}
+
+
+def _insert(model, objs, author):
+    """
+    bulk_create в одной транзакции. SQLite не возвращает первичные
+    ключи, поэтому созданные строки перечитываются по pk > прежнего
+    максимума у этого автора.
+    """
+    with transaction.atomic():
+        last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        model.objects.bulk_create(objs)
+        if all(obj.pk is not None for obj in objs):
+            return objs
+        return list(model.objects.filter(
+            author=author, pk__gt=last
+        ).order_by('pk'))
+
+
+def create_posts(author, items):
+    """
+    Проверяет элементы как PostForm и создаёт все записи разом;
+    при любой ошибке не создаёт ничего и поднимает BatchError.
+    """
+    posts, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'errors': NOT_AN_OBJECT})
+            continue
+        form = PostForm(data=item)
+        if not form.is_valid():
+            errors.append({'index': index, 'errors': _form_errors(form)})
+            continue
+        post = form.save(commit=False)
+        post.author = author
+        posts.append(post)
+    if errors:
+        raise BatchError(errors)
+    with transaction.atomic():
+        posts = _insert(Post, posts, author)
+        # Сигналы post_save при bulk_create не отправляются.
+        stats.change(author.pk, post_count=len(posts))
+        timeline.fan_out_posts(posts)
+        search.index_posts(posts)
+    authors.invalidate(author.pk)
+    feed_cache.bump_generation()
+    return posts
+
+
+def create_comments(author, items):
+    """Как create_posts, но для CommentForm и поля post с id записи."""
+    post_ids = {
+        item['post'] for item in items
+        if isinstance(item, dict) and _is_id(item.get('post'))
+    }
+    known = set(
+        Post.objects.filter(pk__in=post_ids).values_list('pk', flat=True)
+    )
+    comments, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'errors': NOT_AN_OBJECT})
+            continue
+        form = CommentForm(data=item)
+        item_errors = {} if form.is_valid() else _form_errors(form)
+        post_id = item.get('post')
+        if not _is_id(post_id):
+            item_errors['post'] = ['Ожидается id записи']
+        elif post_id not in known:
+            item_errors['post'] = ['Запись не найдена']
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        comment = form.save(commit=False)
+        comment.author = author
+        comment.post_id = post_id
+        comments.append(comment)
+    if errors:
+        raise BatchError(errors)
+    with transaction.atomic():
+        comments = _insert(Comment, comments, author)
+        # Сигналы post_save при bulk_create не отправляются.
+        added = Counter(comment.post_id for comment in comments)
+        for post_id, count in added.items():
+            Post.objects.filter(pk=post_id).update(
+                comment_count=F('comment_count') + count
+            )
+            trending.comment_added(post_id, count)
+    feed_cache.bump_generation()
+    return comments
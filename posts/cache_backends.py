@@ -0,0 +1,107 @@
+import threading
+
+from django.conf import settings
+from django.core.cache.backends import db, filebased, locmem
+from django.db import connections, router, transaction
+
+
+HITS_KEY = 'cache-stats:hits'
+MISSES_KEY = 'cache-stats:misses'
+
+_missing = object()
+_local = threading.local()
+
+
+def request_counters():
+    """Попадания/промахи кэша в текущем потоке (для замеров на запрос)."""
+    return getattr(_local, 'hits', 0), getattr(_local, 'misses', 0)
+
+
+class StatsMixin:
+    """
+    Считает попадания и промахи get() и периодически сбрасывает счётчики
+    в сам кэш, чтобы их видели все процессы с общим бэкендом.
+    Прибавки идут через incr(): у LocMemCache и DatabaseCache ниже он
+    атомарен, а у FileBasedCache — это get() и set() файла, и два
+    процесса, сбросившие счётчики одновременно, могут потерять прибавку.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._pending = [0, 0]
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        hit = value is not _missing
+        if not getattr(_local, 'flushing', False):
+            self._record(hit)
+        return value if hit else default
+
+    def _record(self, hit):
+        name = 'hits' if hit else 'misses'
+        setattr(_local, name, getattr(_local, name, 0) + 1)
+        with self._stats_lock:
+            self._pending[0 if hit else 1] += 1
+            pending = sum(self._pending)
+        if pending >= settings.CACHE_STATS_FLUSH_EVERY:
+            self.flush_stats()
+
+    def flush_stats(self):
+        with self._stats_lock:
+            hits, misses = self._pending
+            self._pending = [0, 0]
+        _local.flushing = True
+        try:
+            for key, delta in ((HITS_KEY, hits), (MISSES_KEY, misses)):
+                if delta:
+                    self.add(key, 0, None)
+                    self.incr(key, delta)
+        finally:
+            _local.flushing = False
+
+    def stats(self):
+        self.flush_stats()
+        _local.flushing = True
+        try:
+            hits = self.get(HITS_KEY, 0)
+            misses = self.get(MISSES_KEY, 0)
+        finally:
+            _local.flushing = False
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._pending = [0, 0]
+        self.delete_many([HITS_KEY, MISSES_KEY])
+
+
+class LocMemCache(StatsMixin, locmem.LocMemCache):
+    pass
+
+
+class FileBasedCache(StatsMixin, filebased.FileBasedCache):
+    pass
+
+
+class DatabaseCache(StatsMixin, db.DatabaseCache):
+    def incr(self, key, delta=1, version=None):
+        # В Django incr() у DatabaseCache — это get() и set(). Строка
+        # ключа блокируется пустым UPDATE до конца транзакции, и
+        # параллельные процессы прибавляют по очереди.
+        alias = router.db_for_write(self.cache_model_class)
+        connection = connections[alias]
+        table = connection.ops.quote_name(self._table)
+        with transaction.atomic(using=alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET expires = expires '
+                    f'WHERE cache_key = %s',
+                    [self.make_key(key, version)],
+                )
+            return super().incr(key, delta, version)
@@ -0,0 +1,70 @@
+import hashlib
+
+from django.views.decorators.http import condition
+
+from .authors import load_author
+from .feed_cache import (
+    get_generation, get_modified, page_position, validators_enabled,
+)
+
+
+def page_scopes(request, username=None, **kwargs):
+    """
+    Поколения, от которых зависит страница: общее, зрителя, а для
+    страниц автора ещё его подписки и подписчики. Считается один раз
+    на запрос, без выборки записей.
+    """
+    if hasattr(request, '_page_scopes'):
+        return request._page_scopes
+    scopes = [None]
+    if request.user.is_authenticated:
+        scopes.append(f'user:{request.user.id}')
+    if username is not None:
+        author = load_author(request, username)
+        if author is None:
+            scopes = None
+        else:
+            author_id = author['profile'].pk
+            scopes += [f'user:{author_id}', f'followers:{author_id}']
+    request._page_scopes = scopes
+    return scopes
+
+
+def page_etag(request, *args, **kwargs):
+    if not validators_enabled():
+        return None
+    scopes = page_scopes(request, **kwargs)
+    if scopes is None:
+        return None
+    key = ':'.join(str(part) for part in (
+        request.path,
+        page_position(request),
+        request.GET.get('comments', ''),
+        request.user.id,
+        *(get_generation(scope) for scope in scopes),
+    ))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def page_last_modified(request, *args, **kwargs):
+    if not validators_enabled():
+        return None
+    scopes = page_scopes(request, **kwargs)
+    if scopes is None:
+        return None
+    # Без отметки общего поколения дата неизвестна; у личных поколений
+    # её нет, пока они ни разу не менялись.
+    dates = [get_modified(scope) for scope in scopes]
+    if dates[0] is None:
+        return None
+    return max(date for date in dates if date is not None)
+
+
+def conditional_page(view):
+    """
+    ETag и Last-Modified по поколениям кэша лент: на совпадающий
+    If-None-Match/If-Modified-Since отвечаем 304 до запуска view.
+    """
+    return condition(
+        etag_func=page_etag, last_modified_func=page_last_modified
+    )(view)
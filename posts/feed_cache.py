@@ -0,0 +1,92 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .replicas import reading_replica
+
+
+GENERATION_KEY = 'feed:generation'
+
+
+def _generation_key(scope=None):
+    return GENERATION_KEY if scope is None else f'{GENERATION_KEY}:{scope}'
+
+
+def get_generation(scope=None):
+    key = _generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def _initial_generation():
+    # Ключ поколения могли вытеснить или очистить. Отсчёт заново идёт
+    # от текущего времени в наносекундах: поколения растут на 1 за
+    # изменение, и чтобы догнать часы, нужно больше миллиарда
+    # изменений в секунду. Так новое начало не совпадёт с поколением,
+    # выданным раньше, и старые фрагменты и ETag не оживут.
+    return time.time_ns()
+
+
+def validators_enabled():
+    """
+    Можно ли выдавать ETag и Last-Modified по поколениям: только если
+    кэш общий для всех процессов (FEED_CACHE_SHARED) и ответ читается
+    не с реплики.
+    """
+    return settings.FEED_CACHE_SHARED and not reading_replica()
+
+
+def get_modified(scope=None):
+    """Время последней смены поколения scope или None, если неизвестно."""
+    return cache.get(f'{_generation_key(scope)}:modified')
+
+
+def bump_generation(scope=None):
+    """Делает устаревшими все фрагменты лент, зависящие от scope."""
+    key = _generation_key(scope)
+    cache.set(f'{key}:modified', timezone.now(), None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_generation(), None)
+        return cache.incr(key)
+
+
+def page_position(request):
+    """
+    Курсор или номер страницы ленты. Прочие параметры адреса в ключи
+    не попадают: иначе ?x=1, ?x=2, ... заводят новые записи в кэше.
+    """
+    return request.GET.get('cursor') or request.GET.get('page') or '1'
+
+
+def feed_cache_key(request, feed, *parts, scopes=()):
+    """
+    Ключ фрагмента ленты: тип ленты, группа/автор, страница или курсор,
+    зритель (от него зависит кнопка «Редактировать») и поколения.
+    """
+    position = page_position(request)
+    generations = [get_generation()]
+    generations.extend(get_generation(scope) for scope in scopes)
+    return ':'.join(str(part) for part in (
+        feed,
+        *parts,
+        position,
+        request.user.id,
+        *generations,
+    ))
+
+
+def feed_cache_context(request, feed, *parts, scopes=()):
+    key = None
+    if not reading_replica():
+        key = feed_cache_key(request, feed, *parts, scopes=scopes)
+    return {
+        'feed_cache_key': key,
+        'feed_cache_timeout': settings.FEED_CACHE_TIMEOUT,
+    }
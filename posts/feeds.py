@@ -0,0 +1,190 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, SyndicationFeed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .feed_cache import get_generation, get_modified, validators_enabled
+from .models import Group, Post, User
+
+
+class JSONFeed(SyndicationFeed):
+    """JSON Feed 1.1 (https://jsonfeed.org/version/1.1)."""
+    content_type = 'application/feed+json; charset=utf-8'
+
+    def write(self, outfile, encoding):
+        document = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'feed_url': self.feed['feed_url'],
+            'description': self.feed['description'],
+            'items': [self.item(item) for item in self.items],
+        }
+        outfile.write(json.dumps(document, ensure_ascii=False))
+
+    @staticmethod
+    def item(item):
+        data = {
+            'id': item['unique_id'] or item['link'],
+            'url': item['link'],
+            'title': item['title'],
+            'content_text': item['description'],
+            'date_published': item['pubdate'].isoformat(),
+            'authors': [{
+                'name': item['author_name'],
+                'url': item['author_link'],
+            }],
+        }
+        if item['categories']:
+            data['tags'] = list(item['categories'])
+        return data
+
+
+class PostsFeed(Feed):
+    feed_type = Atom1Feed
+
+    def posts(self, obj):
+        return Post.objects.select_related('author', 'group')
+
+    def items(self, obj):
+        return self.posts(obj)[:settings.SYNDICATION_ITEMS]
+
+    def item_title(self, post):
+        return post.title or Truncator(post.text).words(8)
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('post', args=[post.author.username, post.pk])
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return reverse('profile', args=[post.author.username])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_categories(self, post):
+        return [post.group.title] if post.group else []
+
+
+class IndexFeed(PostsFeed):
+    title = 'Yatube: последние обновления'
+    description = 'Последние записи на сайте'
+
+    def link(self):
+        return reverse('index')
+
+
+class GroupFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def posts(self, group):
+        return super().posts(group).filter(group=group)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse('group', args=[group.slug])
+
+
+class ProfileFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def posts(self, author):
+        return super().posts(author).filter(author=author)
+
+    def title(self, author):
+        return f'Yatube: @{author.username}'
+
+    def description(self, author):
+        return f'Записи {author.get_full_name() or author.username}'
+
+    def link(self, author):
+        return reverse('profile', args=[author.username])
+
+
+def feed_etag(request, *args, **kwargs):
+    # Ленты одинаковы для всех зрителей и не читают параметры адреса:
+    # достаточно пути и поколения, а ?x=1, ?x=2, ... не плодят записи.
+    key = f'{request.get_host()}{request.path}:{get_generation()}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def feed_validator_etag(request, *args, **kwargs):
+    if validators_enabled():
+        return feed_etag(request)
+    return None
+
+
+def feed_last_modified(request, *args, **kwargs):
+    if validators_enabled():
+        return get_modified()
+    return None
+
+
+def cached_feed(feed_class):
+    """
+    View ленты с документом в кэше до следующей смены поколения
+    (любое изменение записей) и с ответом 304 на условный GET.
+    """
+    feed = feed_class()
+
+    def view(request, *args, **kwargs):
+        key = f'syndication:{feed_etag(request)}'
+        document = cache.get(key)
+        if document is None:
+            response = feed(request, *args, **kwargs)
+            # Last-Modified выставит condition() по поколению, как и
+            # для ответа из кэша.
+            del response['Last-Modified']
+            cache.set(
+                key,
+                (response['Content-Type'], response.content),
+                settings.FEED_CACHE_TIMEOUT,
+            )
+            return response
+        content_type, content = document
+        return HttpResponse(content, content_type=content_type)
+
+    return condition(
+        etag_func=feed_validator_etag,
+        last_modified_func=feed_last_modified,
+    )(view)
+
+
+class IndexJSONFeed(IndexFeed):
+    feed_type = JSONFeed
+
+
+class GroupJSONFeed(GroupFeed):
+    feed_type = JSONFeed
+
+
+class ProfileJSONFeed(ProfileFeed):
+    feed_type = JSONFeed
+
+
+index_atom = cached_feed(IndexFeed)
+index_json = cached_feed(IndexJSONFeed)
+group_atom = cached_feed(GroupFeed)
+group_json = cached_feed(GroupJSONFeed)
+profile_atom = cached_feed(ProfileFeed)
+profile_json = cached_feed(ProfileJSONFeed)
@@ -1,7 +1,9 @@
 from django import forms
 from django.db.models import fields
 
+from .images import check_upload
 from .models import Post, Comment
+from .thumbnails import schedule
 
 
 class PostForm(forms.ModelForm):
@@ -9,6 +11,32 @@ class PostForm(forms.ModelForm):
         model = Post
         fields = ('group', 'text', 'image')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_error = None
+        name = self.add_prefix('image')
+        upload = self.files.get(name)
+        if upload is not None:
+            self.upload_error = check_upload(upload)
+            if self.upload_error:
+                # Не отдаём файл в ImageField, чтобы Pillow его не открывал.
+                self.files = self.files.copy()
+                del self.files[name]
+
+    def clean_image(self):
+        if self.upload_error:
+            raise forms.ValidationError(self.upload_error)
+        return self.cleaned_data['image']
+
+    def save(self, commit=True):
+        image_changed = 'image' in self.changed_data
+        if image_changed:
+            self.instance.thumbnail_url = ''
+        post = super().save(commit)
+        if commit and image_changed and post.image:
+            schedule(post.pk)
+        return post
+
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
@@ -0,0 +1,58 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.images import get_image_dimensions
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+
+def check_upload(upload):
+    """
+    Проверяет загруженную картинку до декодирования: размер файла и
+    размеры в пикселях из заголовка. Возвращает текст ошибки или None.
+    """
+    if upload.size > settings.POSTS_IMAGE_MAX_BYTES:
+        return (
+            'Файл слишком большой, максимум '
+            f'{filesizeformat(settings.POSTS_IMAGE_MAX_BYTES)}'
+        )
+    width, height = get_image_dimensions(upload)
+    if width and height and width * height > settings.POSTS_IMAGE_MAX_PIXELS:
+        return f'Картинка слишком большая: {width}×{height} пикселей'
+    return None
+
+
+def shrink(field_file):
+    """
+    Уменьшает картинку до POSTS_IMAGE_MAX_SIDE по большей стороне и
+    перекодирует её. Возвращает новое имя файла или None, если не нужно.
+    """
+    max_side = settings.POSTS_IMAGE_MAX_SIDE
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as image:
+            if max(image.size) <= max_side:
+                return None
+            # JPEG умеет декодироваться сразу в уменьшенном масштабе.
+            image.draft('RGB', (max_side, max_side))
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                image_format, extension = 'PNG', 'png'
+            else:
+                image = image.convert('RGB')
+                image_format, extension = 'JPEG', 'jpg'
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+            buffer = BytesIO()
+            image.save(buffer, image_format, quality=85, optimize=True)
+    finally:
+        field_file.close()
+    old_name = field_file.name
+    base = os.path.splitext(os.path.basename(old_name))[0]
+    new_name = field_file.storage.save(
+        f'{field_file.field.upload_to}{base}.{extension}',
+        ContentFile(buffer.getvalue()),
+    )
+    field_file.storage.delete(old_name)
+    return new_name
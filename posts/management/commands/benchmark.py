@@ -0,0 +1,80 @@
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from posts import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон маршрутов posts и users на синтетических данных '
+        'во временной базе: p50/p95, запросы к БД и память на запрос'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--follow-density', type=float, default=0.1)
+        parser.add_argument('--comments', type=int, default=2)
+        parser.add_argument('--images', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument(
+            '--route', action='append', dest='routes',
+            help='Имя маршрута; можно указать несколько раз',
+        )
+        parser.add_argument('--output', help='Куда сохранить JSON')
+        parser.add_argument('--compare', help='JSON прошлого прогона')
+        parser.add_argument('--tolerance', type=float, default=0.2)
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        config = {
+            name: options[name] for name in (
+                'users', 'posts', 'follow_density', 'comments', 'images',
+                'requests', 'warmup',
+            )
+        }
+        media_root = tempfile.mkdtemp()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(
+                MEDIA_ROOT=media_root, THUMBNAIL_ASYNC=False
+            ):
+                benchmark.seed(
+                    users=options['users'],
+                    posts=options['posts'],
+                    follow_density=options['follow_density'],
+                    comments=options['comments'],
+                    images=options['images'],
+                )
+                routes = benchmark.run(
+                    requests=options['requests'],
+                    warmup=options['warmup'],
+                    routes=options['routes'],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(media_root, ignore_errors=True)
+        result = {'config': config, 'routes': routes}
+        for name, row in routes.items():
+            self.stdout.write(
+                f'{name:22} {row["method"]:6} p50={row["p50_ms"]:8.2f}ms '
+                f'p95={row["p95_ms"]:8.2f}ms queries={row["queries"]:3} '
+                f'mem={row["peak_memory_kb"]:8.1f}KB status={row["status"]}'
+            )
+        if options['output']:
+            benchmark.dump(result, options['output'])
+        if options['compare']:
+            regressions = benchmark.compare(
+                result, benchmark.load(options['compare']),
+                options['tolerance'],
+            )
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(line))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'Регрессий: {len(regressions)}')
@@ -0,0 +1,26 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша (общие для всех воркеров)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', default='default')
+        parser.add_argument(
+            '--reset', action='store_true', help='Обнулить счётчики',
+        )
+
+    def handle(self, *args, **options):
+        cache = caches[options['alias']]
+        if not hasattr(cache, 'stats'):
+            raise CommandError(
+                f'Бэкенд кэша {options["alias"]} не ведёт статистику'
+            )
+        stats = cache.stats()
+        self.stdout.write(
+            f'hits={stats["hits"]} misses={stats["misses"]} '
+            f'hit_rate={stats["hit_rate"]:.2%}'
+        )
+        if options['reset']:
+            cache.reset_stats()
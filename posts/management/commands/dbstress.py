@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from posts import benchmark, stress
+from posts.db import pragmas
+
+
+# Поведение SQLite по умолчанию, явно: режим журнала хранится в файле базы.
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузка читателями и писателями на временную файловую базу '
+        'SQLite: PRAGMA по умолчанию против SQLITE_TUNED_PRAGMAS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--posts', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда сравнивает настройки SQLite')
+        directory = tempfile.mkdtemp()
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        old_test_name = test_settings.get('NAME')
+        test_settings['NAME'] = os.path.join(directory, 'stress.sqlite3')
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            benchmark.seed(users=20, posts=options['posts'], comments=1)
+            profiles = (
+                ('default', DEFAULT_PRAGMAS),
+                ('tuned', settings.SQLITE_TUNED_PRAGMAS),
+            )
+            for name, profile in profiles:
+                with override_settings(SQLITE_PRAGMAS=profile):
+                    connection.close()
+                    applied = pragmas(connection)
+                    result = stress.run(
+                        options['seconds'],
+                        options['readers'],
+                        options['writers'],
+                    )
+                self.stdout.write(
+                    f'{name:8} reads/s={result["reads_per_sec"]:8.1f} '
+                    f'writes/s={result["writes_per_sec"]:8.1f} '
+                    f'errors={result["read_errors"]}/'
+                    f'{result["write_errors"]} '
+                    f'journal={applied["journal_mode"]}'
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = old_test_name
+            shutil.rmtree(directory, ignore_errors=True)
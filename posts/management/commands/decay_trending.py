@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Затухание счёта популярности записей; запускать по расписанию, '
+        'например раз в час'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Пересчитать счета с нуля по недавним комментариям и подпискам',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            count = trending.rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f'Счета пересчитаны, записей с ненулевым счётом: {count}'
+            ))
+            return
+        factor = trending.decay()
+        self.stdout.write(self.style.SUCCESS(
+            f'Счета уменьшены, множитель {factor:.4f}'
+        ))
@@ -0,0 +1,32 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import bulk
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка групп, записей, комментариев и подписок'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=list(bulk.SPECS))
+        parser.add_argument('path', help='Файл выгрузки или - для stdout')
+        parser.add_argument('--format', choices=bulk.FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = bulk.detect_format(path, options['format'])
+        started = time.monotonic()
+        rows = bulk.export_rows(options['model'], options['chunk_size'])
+        if path == '-':
+            bulk.write_rows(rows, sys.stdout, fmt, options['model'])
+            return
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            count = bulk.write_rows(rows, stream, fmt, options['model'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Выгружено {count} строк за {elapsed:.1f} с '
+            f'({count / elapsed if elapsed else 0:.0f} строк/с)'
+        ))
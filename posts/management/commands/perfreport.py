@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import perf
+
+
+class Command(BaseCommand):
+    help = 'Сводка замеров InstrumentationMiddleware по именам маршрутов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Файл с замерами')
+        parser.add_argument(
+            '--hours', type=float,
+            help='Учитывать только замеры за последние N часов',
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['hours']:
+            since = time.time() - options['hours'] * 3600
+        report = perf.summarize(options['path'], since)
+        if not report:
+            self.stdout.write('Замеров нет')
+            return
+        for name, row in report.items():
+            self.stdout.write(
+                f'{name:22} n={row["requests"]:<6} '
+                f'p50={row["p50_ms"]:8.2f}ms p95={row["p95_ms"]:8.2f}ms '
+                f'queries={row["queries"]:6.1f} db={row["db_ms"]:8.2f}ms '
+                f'tpl={row["template_ms"]:8.2f}ms '
+                f'cache={row["cache_hit_rate"]:.0%}'
+            )
+            if row['slowest_sql']:
+                self.stdout.write(
+                    f'    {row["slowest_sql"]["ms"]:.2f}ms '
+                    f'{row["slowest_sql"]["sql"][:200]}'
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Маршрутов: {len(report)}'
+        ))
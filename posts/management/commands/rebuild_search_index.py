@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import search
+from posts.models import Post, SearchToken
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает поисковый индекс записей'
+
+    def handle(self, *args, **options):
+        SearchToken.objects.all().delete()
+        count = 0
+        for post in Post.objects.only('pk', 'title', 'text').iterator():
+            search.index_post(post)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Поисковый индекс пересобран, записей: {count}'
+        ))
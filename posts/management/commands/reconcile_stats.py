@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики записей и подписок в UserStats '
+        'и число комментариев у записей'
+    )
+
+    def handle(self, *args, **options):
+        fixed = stats.reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики сверены, исправлено профилей: {fixed}'
+        ))
+        posts = stats.recount_comments()
+        self.stdout.write(self.style.SUCCESS(
+            f'Комментарии пересчитаны у записей: {posts}'
+        ))
@@ -0,0 +1,155 @@
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends import django as django_backend
+
+from . import perf
+from .cache_backends import request_counters
+
+
+logger = logging.getLogger('posts.perf')
+_done = object()
+_patch_lock = threading.Lock()
+
+
+def instrument_templates():
+    """
+    Оборачивает рендер шаблонов верхнего уровня (включения рендерятся
+    внутри и отдельно не считаются). Ставится из InstrumentationMiddleware
+    только при PERF_INSTRUMENTATION; без активного замера обёртка просто
+    вызывает исходный метод.
+    """
+    template_class = django_backend.Template
+    with _patch_lock:
+        if getattr(template_class.render, 'instrumented', False):
+            return
+        original = template_class.render
+
+        def render(self, context=None, request=None):
+            recorder = perf.current_recorder()
+            if recorder is None:
+                return original(self, context, request)
+            started = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                recorder.template_ms += (time.perf_counter() - started) * 1000
+
+        render.instrumented = True
+        template_class.render = render
+
+
+@contextmanager
+def recording(recorder):
+    """Замер SQL на всех соединениях и шаблонов в текущем потоке."""
+    perf.set_recorder(recorder)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield
+    finally:
+        perf.set_recorder(None)
+
+
+class InstrumentationMiddleware:
+    """
+    Замеряет запрос: число и время SQL, время рендера шаблонов,
+    попадания и промахи кэша, самые медленные запросы. Отдаёт их
+    в заголовке Server-Timing и строкой JSON в логгер posts.perf,
+    часть запросов сохраняет в SQLite для ``manage.py perfreport``.
+    Включается настройкой PERF_INSTRUMENTATION.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        recorder = perf.Recorder(settings.PERF_SLOW_QUERIES)
+        counters = request_counters()
+        started = time.perf_counter()
+        with recording(recorder):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        if response.streaming:
+            # Тело потока рендерится уже после выхода из middleware:
+            # замер продолжается, пока поток не дочитан, а заголовки
+            # к этому времени уже отправлены — только лог и выборка.
+            response.streaming_content = self.stream(
+                request, response, recorder, counters, total_ms,
+                response.streaming_content,
+            )
+            return response
+        sample = self.finish(request, response, recorder, counters, total_ms)
+        response['Server-Timing'] = self.server_timing(sample)
+        return response
+
+    def stream(self, request, response, recorder, counters, total_ms,
+               content):
+        chunks = iter(content)
+        try:
+            while True:
+                started = time.perf_counter()
+                db_ms = recorder.db_ms
+                with recording(recorder):
+                    chunk = next(chunks, _done)
+                spent = (time.perf_counter() - started) * 1000
+                total_ms += spent
+                # Записи потока рендерятся шаблоном движка напрямую, мимо
+                # обёртки бэкенда: всё время вне SQL — это рендер.
+                recorder.template_ms += spent - (recorder.db_ms - db_ms)
+                if chunk is _done:
+                    break
+                yield chunk
+        finally:
+            self.finish(request, response, recorder, counters, total_ms)
+
+    def finish(self, request, response, recorder, counters, total_ms):
+        hits, misses = counters
+        hits_after, misses_after = request_counters()
+        match = request.resolver_match
+        sample = {
+            'created': time.time(),
+            'url_name': match.url_name if match and match.url_name else '-',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 3),
+            'db_ms': round(recorder.db_ms, 3),
+            'queries': recorder.queries,
+            'template_ms': round(recorder.template_ms, 3),
+            'cache_hits': hits_after - hits,
+            'cache_misses': misses_after - misses,
+            'slow_sql': [
+                {'ms': round(elapsed, 3), 'sql': sql}
+                for elapsed, sql in recorder.slowest
+            ],
+        }
+        logger.info(json.dumps(sample, ensure_ascii=False))
+        if random.random() < settings.PERF_SAMPLE_RATE:
+            try:
+                perf.store(sample)
+            except (OSError, sqlite3.Error):
+                logger.exception('Не удалось сохранить замер')
+        return sample
+
+    @staticmethod
+    def server_timing(sample):
+        return ', '.join((
+            f'db;dur={sample["db_ms"]:.1f};desc="{sample["queries"]} queries"',
+            f'tpl;dur={sample["template_ms"]:.1f}',
+            f'cache;desc="hits={sample["cache_hits"]} '
+            f'misses={sample["cache_misses"]}"',
+            f'total;dur={sample["total_ms"]:.1f}',
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.6 on 2026-10-18 17:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_search_index(apps, schema_editor):
+    from posts.search import tokenize
+
+    Post = apps.get_model('posts', 'Post')
+    SearchToken = apps.get_model('posts', 'SearchToken')
+    for post in Post.objects.only('pk', 'title', 'text').iterator():
+        tokens = tokenize(f'{post.title or ""} {post.text}')
+        SearchToken.objects.bulk_create(
+            SearchToken(token=token, post_id=post.pk, weight=weight)
+            for token, weight in tokens.items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_userstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64, verbose_name='Токен')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='posts.Post', verbose_name='Запись')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchtoken',
+            constraint=models.UniqueConstraint(fields=('token', 'post'), name='unique_search_token'),
+        ),
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 2.2.6 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    UserStats = apps.get_model('posts', 'UserStats')
+    keep = (
+        Follow.objects.values('user', 'author')
+        .annotate(first_id=models.Min('id'))
+        .values_list('first_id', flat=True)
+    )
+    duplicates = Follow.objects.exclude(id__in=list(keep))
+    users, authors = set(), set()
+    for user_id, author_id in duplicates.values_list('user', 'author'):
+        users.add(user_id)
+        authors.add(author_id)
+    duplicates.delete()
+    # Сигналы в миграции не срабатывают, а 0009 посчитала дубли в
+    # счётчиках: пересчитываем их у затронутых пользователей.
+    for user_id in users:
+        UserStats.objects.filter(user_id=user_id).update(
+            following_count=Follow.objects.filter(user=user_id).count()
+        )
+    for author_id in authors:
+        UserStats.objects.filter(user_id=author_id).update(
+            followers_count=Follow.objects.filter(author=author_id).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_thumbnail_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', '-created'], name='comment_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-pub_date'], name='post_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date'], name='post_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', '-pub_date'], name='post_group_pub_date_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_follows, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('user', 'author'), name='unique_follow'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:06
+
+import datetime
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_score'),
+    ]
+
+    # Дата старых подписок неизвестна: ставим заведомо старую, чтобы
+    # decay_trending --rebuild не считал их свежими.
+    operations = [
+        migrations.AddField(
+            model_name='follow',
+            name='created',
+            field=models.DateTimeField(default=datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc), verbose_name='Дата подписки'),
+        ),
+        migrations.AlterField(
+            model_name='follow',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата подписки'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_follow_created'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingDecay',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('decayed', models.DateTimeField(verbose_name='Последнее затухание')),
+            ],
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth import get_user_model
 from django.db.models.deletion import CASCADE
+from django.utils import timezone
 
 
 User = get_user_model() 
@@ -29,6 +30,12 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Всё, что нужно карточке post_item.html, одним запросом."""
+        return self.select_related('author', 'group')
+
+
 class Post(models.Model):
     title = models.CharField(
         'Заголовок',
@@ -67,20 +74,62 @@ class Post(models.Model):
         blank=True,
         null=True,
     )
-    objects = models.Manager()
+    thumbnail_url = models.CharField(
+        'Миниатюра',
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Комментариев',
+        default=0,
+        editable=False,
+    )
+    score = models.FloatField(
+        'Популярность',
+        default=0,
+        editable=False,
+    )
+    objects = PostQuerySet.as_manager()
+
+    COUNTER_FIELDS = ('comment_count', 'score')
     
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['-pub_date'], name='post_pub_date_idx'),
+            models.Index(
+                fields=['author', '-pub_date'], name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date'], name='post_group_pub_date_idx'
+            ),
+            models.Index(fields=['-score', '-id'], name='post_score_idx'),
+        ]
     
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        # Счётчики меняются только через UPDATE с F(): сохранение
+        # формы не должно затирать их значениями, прочитанными раньше.
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
         Post,
         verbose_name='Комментарий',
         on_delete=models.CASCADE,
+        related_name='comments',
         help_text= 'Напите комментарий'
     )
     author = models.ForeignKey(
@@ -102,11 +151,37 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(
+                fields=['post', '-created'], name='comment_post_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:5]
 
 
+class FollowManager(models.Manager):
+    def follow(self, user, author):
+        """
+        Подписка одним INSERT: повтор отсекает ограничение unique_follow.
+        Возвращает True, если подписка создана.
+        """
+        if user.pk == author.pk:
+            return False
+        try:
+            with transaction.atomic():
+                self.create(user=user, author=author)
+        except IntegrityError:
+            return False
+        return True
+
+    def unfollow(self, user, author):
+        """Возвращает True, если подписка была и удалена."""
+        deleted, _ = self.filter(user=user, author=author).delete()
+        return bool(deleted)
+
+
 class Follow(models.Model):
     user = models.ForeignKey(
         User,
@@ -120,4 +195,92 @@ class Follow(models.Model):
         on_delete=CASCADE,
         related_name='following',
     )
+    created = models.DateTimeField('Дата подписки', default=timezone.now)
+    objects = FollowManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'], name='unique_follow'
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        verbose_name='Подписчик',
+        on_delete=models.CASCADE,
+        related_name='timeline',
+    )
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Запись',
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+    author = models.ForeignKey(
+        User,
+        verbose_name='Автор',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['user', '-pub_date']),
+            models.Index(fields=['user', 'author']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_timeline_entry'
+            ),
+        ]
+
+
+class UserStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    post_count = models.PositiveIntegerField('Записей', default=0)
+    followers_count = models.PositiveIntegerField('Подписчиков', default=0)
+    following_count = models.PositiveIntegerField('Подписок', default=0)
     objects = models.Manager()
+
+    def __str__(self):
+        return f'stats:{self.user_id}'
+
+
+class SearchToken(models.Model):
+    token = models.CharField('Токен', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        verbose_name='Запись',
+        on_delete=models.CASCADE,
+        related_name='search_tokens',
+    )
+    weight = models.PositiveIntegerField('Вес', default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['token', 'post'], name='unique_search_token'
+            ),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
+class TrendingDecay(models.Model):
+    """Когда счета популярности последний раз уменьшались (одна строка)."""
+    decayed = models.DateTimeField('Последнее затухание')
+
+    def __str__(self):
+        return f'decayed:{self.decayed}'
@@ -0,0 +1,179 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction, values], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return direction, values
+
+
+class CursorPage:
+    """Страница keyset-пагинации: без COUNT(*) и без OFFSET."""
+    cursor_based = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<CursorPage of %s>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.cursor_for(self.object_list[-1], 'next')
+
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.cursor_for(self.object_list[0], 'prev')
+
+
+class CursorPaginator:
+    """
+    Пагинация по ключу сортировки, например (pub_date, id).
+    Все поля ordering должны идти в одном направлении.
+    """
+    cursor_based = True
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-pk')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.descending = self.ordering[0].startswith('-')
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def _model_field(self, name):
+        opts = self.object_list.model._meta
+        if name == 'pk':
+            return opts.pk
+        # Сортировать можно и по аннотации, например по дате из
+        # связанной таблицы, чей индекс задаёт порядок ленты.
+        annotation = self.object_list.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return opts.get_field(name)
+
+    def cursor_for(self, obj, direction):
+        values = []
+        for name in self.fields:
+            value = getattr(obj, 'pk' if name == 'pk' else name)
+            values.append(
+                value.isoformat() if hasattr(value, 'isoformat')
+                else str(value)
+            )
+        return encode_cursor(direction, values)
+
+    def _seek(self, values, forward):
+        lookup = 'lt' if self.descending == forward else 'gt'
+        condition = Q()
+        equal = {}
+        for name, value in zip(self.fields, values):
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _reversed_ordering(self):
+        return [
+            name[1:] if name.startswith('-') else '-' + name
+            for name in self.ordering
+        ]
+
+    def get_page(self, cursor=None):
+        direction, values = 'next', None
+        if cursor:
+            try:
+                direction, raw = decode_cursor(cursor)
+                if len(raw) != len(self.fields):
+                    raise InvalidCursor(cursor)
+                values = [
+                    self._model_field(name).to_python(value)
+                    for name, value in zip(self.fields, raw)
+                ]
+            except (InvalidCursor, ValidationError):
+                direction, values = 'next', None
+        forward = direction == 'next'
+        queryset = self.object_list
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward))
+        if forward:
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.order_by(*self._reversed_ordering())
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if forward:
+            return CursorPage(rows, self, has_more, values is not None)
+        if not rows:
+            # Курсор назад дальше самой новой строки (её могли удалить,
+            # пока ссылка «назад» была открыта) — отдаём первую страницу.
+            return self.get_page()
+        rows.reverse()
+        return CursorPage(rows, self, True, has_more)
+
+
+def page_of(paginator, number, lazy=False):
+    """
+    paginator.get_page(number). С lazy=True страница (и COUNT(*) для
+    Paginator) выбирается при первом обращении к ней — для потокового
+    рендера, где шапка уходит раньше.
+    """
+    if lazy:
+        return SimpleLazyObject(lambda: paginator.get_page(number))
+    return paginator.get_page(number)
+
+
+def paginate(request, object_list, per_page=None,
+             ordering=('-pub_date', '-pk'), lazy=False):
+    """
+    Возвращает (page, paginator) для ленты. Курсорный режим включается
+    настройкой POSTS_CURSOR_PAGINATION или параметром ?cursor=.
+    """
+    per_page = per_page or settings.POSTS_PER_PAGE
+    if settings.POSTS_CURSOR_PAGINATION or 'cursor' in request.GET:
+        paginator = CursorPaginator(object_list, per_page, ordering)
+        return page_of(paginator, request.GET.get('cursor'), lazy), paginator
+    paginator = Paginator(object_list, per_page)
+    return page_of(paginator, request.GET.get('page'), lazy), paginator
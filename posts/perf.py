@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .utils import percentile
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS samples (
+    created REAL NOT NULL,
+    url_name TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    total_ms REAL NOT NULL,
+    db_ms REAL NOT NULL,
+    queries INTEGER NOT NULL,
+    template_ms REAL NOT NULL,
+    cache_hits INTEGER NOT NULL,
+    cache_misses INTEGER NOT NULL,
+    slow_sql TEXT NOT NULL
+)
+'''
+COLUMNS = (
+    'created', 'url_name', 'method', 'path', 'status', 'total_ms', 'db_ms',
+    'queries', 'template_ms', 'cache_hits', 'cache_misses', 'slow_sql',
+)
+
+_local = threading.local()
+
+
+class Recorder:
+    """Замеры одного запроса: SQL, шаблоны."""
+
+    def __init__(self, slow_limit):
+        self.slow_limit = slow_limit
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.db_ms += elapsed
+            self._remember(sql, elapsed)
+
+    def _remember(self, sql, elapsed):
+        if len(self.slowest) < self.slow_limit:
+            self.slowest.append((elapsed, sql))
+        elif elapsed > self.slowest[-1][0]:
+            self.slowest[-1] = (elapsed, sql)
+        else:
+            return
+        self.slowest.sort(key=lambda item: -item[0])
+
+
+def current_recorder():
+    return getattr(_local, 'recorder', None)
+
+
+def set_recorder(recorder):
+    _local.recorder = recorder
+
+
+def connect(path=None):
+    connection = sqlite3.connect(path or settings.PERF_SAMPLES_PATH)
+    connection.execute(SCHEMA)
+    return connection
+
+
+def store(sample, path=None):
+    row = dict(sample, slow_sql=json.dumps(sample['slow_sql']))
+    connection = connect(path)
+    try:
+        with connection:
+            connection.execute(
+                f'INSERT INTO samples ({", ".join(COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(COLUMNS))})',
+                [row[column] for column in COLUMNS],
+            )
+    finally:
+        connection.close()
+
+
+def summarize(path=None, since=None):
+    """Сводка сохранённых замеров по именам маршрутов."""
+    path = path or settings.PERF_SAMPLES_PATH
+    if not os.path.exists(path):
+        return {}
+    connection = connect(path)
+    try:
+        rows = connection.execute(
+            f'SELECT {", ".join(COLUMNS)} FROM samples WHERE created >= ?',
+            [since or 0],
+        ).fetchall()
+    finally:
+        connection.close()
+    groups = defaultdict(list)
+    for row in rows:
+        sample = dict(zip(COLUMNS, row))
+        groups[sample['url_name']].append(sample)
+    report = {}
+    for name, samples in sorted(groups.items()):
+        count = len(samples)
+        totals = [sample['total_ms'] for sample in samples]
+        hits = sum(sample['cache_hits'] for sample in samples)
+        lookups = hits + sum(sample['cache_misses'] for sample in samples)
+        slowest = max(
+            (query for sample in samples
+             for query in json.loads(sample['slow_sql'])),
+            key=lambda query: query['ms'],
+            default=None,
+        )
+        report[name] = {
+            'requests': count,
+            'p50_ms': round(percentile(totals, 50), 3),
+            'p95_ms': round(percentile(totals, 95), 3),
+            'queries': round(
+                sum(sample['queries'] for sample in samples) / count, 1
+            ),
+            'db_ms': round(sum(sample['db_ms'] for sample in samples) / count, 3),
+            'template_ms': round(
+                sum(sample['template_ms'] for sample in samples) / count, 3
+            ),
+            'cache_hit_rate': hits / lookups if lookups else 0.0,
+            'slowest_sql': slowest,
+        }
+    return report
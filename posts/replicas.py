@@ -0,0 +1,106 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+PIN_COOKIE = 'primary_pin'
+# Таблица DatabaseCache у каждой базы своя и не реплицируется.
+CACHE_APP_LABEL = 'django_cache'
+
+_state = threading.local()
+
+
+class ReplicaRouter:
+    """
+    Чтение идёт на реплику только внутри view с @read_from_replica,
+    запись всегда на основную базу. Роутер отмечает записи, чтобы
+    @pin_to_primary закрепил автора за основной базой.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        return getattr(_state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != CACHE_APP_LABEL:
+            _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # На реплике те же данные, что и в основной базе.
+        return True
+
+
+def replica_alias():
+    alias = settings.REPLICA_DATABASE
+    return alias if alias in settings.DATABASES else None
+
+
+def reading_replica():
+    """
+    Идёт ли чтение с реплики. Она может отставать от поколений кэша,
+    уже поднятых основной базой, поэтому такие ответы не кладутся в
+    общий кэш и не получают ETag/Last-Modified.
+    """
+    return getattr(_state, 'alias', None) is not None
+
+
+@contextmanager
+def use_database(alias):
+    previous = getattr(_state, 'alias', None)
+    _state.alias = alias
+    try:
+        yield
+    finally:
+        _state.alias = previous
+
+
+def _stream_from(alias, content):
+    with use_database(alias):
+        yield from content
+
+
+def read_from_replica(view):
+    """
+    Запросы view на чтение уходят на реплику, если она настроена и
+    пользователь не закреплён за основной базой после своей записи.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or request.COOKIES.get(PIN_COOKIE):
+            return view(request, *args, **kwargs)
+        # Сессия и пользователь читаются с основной базы: свежий вход
+        # мог ещё не доехать до реплики.
+        request.user.is_authenticated
+        with use_database(alias):
+            response = view(request, *args, **kwargs)
+        if response.streaming:
+            response.streaming_content = _stream_from(
+                alias, response.streaming_content
+            )
+        return response
+    return wrapper
+
+
+def pin_to_primary(view):
+    """
+    Если view что-то записал, следующие REPLICA_PIN_SECONDS секунд
+    пользователь читает с основной базы и видит свои изменения.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        _state.wrote = False
+        response = view(request, *args, **kwargs)
+        if _state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
+    return wrapper
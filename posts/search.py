@@ -0,0 +1,83 @@
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from .models import SearchToken
+
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile(r'^[а-я]+$')
+MIN_STEM = 3
+MAX_TOKEN = 64
+STOP_WORDS = frozenset((
+    'а', 'без', 'бы', 'в', 'во', 'вот', 'вы', 'да', 'для', 'до', 'его',
+    'ее', 'же', 'за', 'и', 'из', 'или', 'к', 'как', 'ко', 'ли', 'мы',
+    'на', 'над', 'не', 'нет', 'ни', 'но', 'о', 'об', 'он', 'она', 'они',
+    'от', 'по', 'под', 'при', 'с', 'со', 'так', 'то', 'ты', 'у', 'уже',
+    'что', 'это', 'я',
+    'a', 'an', 'and', 'in', 'is', 'of', 'on', 'or', 'the', 'to',
+))
+# Окончания русских слов, от длинных к коротким.
+ENDINGS = sorted((
+    'иями', 'ями', 'ами', 'ией', 'иях', 'ях', 'ах', 'ов', 'ев', 'ей', 'ий',
+    'ый', 'ой', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ым', 'им', 'ом', 'ем',
+    'ам', 'ям', 'ых', 'их', 'ого', 'его', 'ому', 'ему', 'ую', 'юю', 'ию',
+    'ия', 'ье', 'ья', 'ью', 'ть', 'ться', 'тся', 'ешь', 'ет', 'ут',
+    'ют', 'ат', 'ят', 'ил', 'ила', 'ило', 'или', 'ал', 'ала', 'ало', 'али',
+    'ел', 'ела', 'ело', 'ели', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь',
+), key=len, reverse=True)
+
+
+def stem(word):
+    """Лёгкий стемминг: отрезает типичное окончание русского слова."""
+    word = word.lower().replace('ё', 'е')
+    if not CYRILLIC_RE.match(word):
+        return word[:MAX_TOKEN]
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM:
+            return word[:-len(ending)][:MAX_TOKEN]
+    return word[:MAX_TOKEN]
+
+
+def tokenize(text):
+    words = WORD_RE.findall((text or '').lower())
+    return Counter(
+        stem(word) for word in words
+        if len(word) > 1 and word not in STOP_WORDS
+    )
+
+
+def index_post(post):
+    index_posts([post])
+
+
+def index_posts(posts):
+    SearchToken.objects.filter(post__in=[post.pk for post in posts]).delete()
+    SearchToken.objects.bulk_create(
+        SearchToken(token=token, post_id=post.pk, weight=weight)
+        for post in posts
+        for token, weight in tokenize(
+            f'{post.title or ""} {post.text}'
+        ).items()
+    )
+
+
+def search_ids(query):
+    """
+    Id записей по убыванию релевантности: сначала больше совпавших слов,
+    затем больший суммарный вес, затем более новые. Число слов запроса
+    и результатов ограничено, чтобы держать время ответа.
+    """
+    terms = list(tokenize(query))[:settings.SEARCH_MAX_TERMS]
+    if not terms:
+        return []
+    ranked = (
+        SearchToken.objects.filter(token__in=terms)
+        .values('post')
+        .annotate(matched=Count('pk'), score=Sum('weight'))
+        .order_by('-matched', '-score', '-post_id')
+        .values_list('post', flat=True)
+    )
+    return list(ranked[:settings.SEARCH_MAX_RESULTS])
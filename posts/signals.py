@@ -0,0 +1,84 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import authors, feed_cache, search, stats, timeline, trending
+from .models import Comment, Follow, Group, Post, User
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    feed_cache.bump_generation()
+    if not raw:
+        search.index_post(instance)
+    if created and not raw:
+        stats.change(instance.author_id, post_count=1)
+        timeline.fan_out_post(instance)
+        authors.invalidate(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    feed_cache.bump_generation()
+    stats.change(instance.author_id, create=False, post_count=-1)
+    authors.invalidate(instance.author_id)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, raw=False, **kwargs):
+    feed_cache.bump_generation(f'user:{instance.user_id}')
+    feed_cache.bump_generation(f'followers:{instance.author_id}')
+    if created and not raw:
+        stats.change(instance.user_id, following_count=1)
+        stats.change(instance.author_id, followers_count=1)
+        timeline.backfill(instance.user_id, instance.author_id)
+        authors.invalidate(instance.author_id, instance.user_id)
+        authors.invalidate(instance.user_id)
+        trending.follower_added(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    feed_cache.bump_generation(f'user:{instance.user_id}')
+    feed_cache.bump_generation(f'followers:{instance.author_id}')
+    stats.change(instance.user_id, create=False, following_count=-1)
+    stats.change(instance.author_id, create=False, followers_count=-1)
+    timeline.prune(instance.user_id, instance.author_id)
+    authors.invalidate(instance.author_id, instance.user_id)
+    authors.invalidate(instance.user_id)
+    trending.follower_removed(instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    feed_cache.bump_generation()
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        trending.comment_added(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    feed_cache.bump_generation()
+    Post.objects.filter(pk=instance.post_id, comment_count__gte=1).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    feed_cache.bump_generation()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    # Сбрасываем и имя -> id: пользователя с этим именем могли удалить
+    # в обход сигналов (flush) и создать заново с другим id.
+    authors.invalidate(instance.pk, username=instance.username)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    authors.invalidate(instance.pk, username=instance.username)
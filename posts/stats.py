@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Follow, Post, User, UserStats
+
+
+def get_stats(user_id):
+    """Счётчики профиля одним запросом по первичному ключу."""
+    stats = UserStats.objects.filter(pk=user_id).first()
+    return stats or UserStats(user_id=user_id)
+
+
+def change(user_id, create=True, **deltas):
+    values = {name: F(name) + delta for name, delta in deltas.items()}
+    guards = {
+        f'{name}__gte': -delta for name, delta in deltas.items() if delta < 0
+    }
+    rows = UserStats.objects.filter(pk=user_id, **guards)
+    with transaction.atomic():
+        updated = rows.update(**values)
+        if not updated and create:
+            UserStats.objects.get_or_create(user_id=user_id)
+            rows.update(**values)
+
+
+def _count(queryset, field):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    ), 0)
+
+
+def actual_counts():
+    return User.objects.annotate(
+        real_post_count=_count(Post.objects.all(), 'author'),
+        real_followers_count=_count(Follow.objects.all(), 'author'),
+        real_following_count=_count(Follow.objects.all(), 'user'),
+    ).values_list(
+        'pk',
+        'real_post_count',
+        'real_followers_count',
+        'real_following_count',
+    )
+
+
+def reconcile():
+    """Сверяет счётчики с реальными данными, возвращает число исправлений."""
+    current = {
+        stats.pk: stats for stats in UserStats.objects.all().iterator()
+    }
+    fixed = 0
+    for user_id, posts, followers, following in actual_counts().iterator():
+        stats = current.get(user_id)
+        if stats is None:
+            if posts or followers or following:
+                UserStats.objects.create(
+                    user_id=user_id,
+                    post_count=posts,
+                    followers_count=followers,
+                    following_count=following,
+                )
+                fixed += 1
+            continue
+        if (stats.post_count, stats.followers_count,
+                stats.following_count) != (posts, followers, following):
+            UserStats.objects.filter(pk=user_id).update(
+                post_count=posts,
+                followers_count=followers,
+                following_count=following,
+            )
+            fixed += 1
+    return fixed
+
+
+def recount_comments(post_ids=None):
+    """
+    Пересчитывает Post.comment_count одним UPDATE (после bulk_create
+    и импорта, где сигналы не срабатывают). Возвращает число записей.
+    """
+    posts = Post.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    return posts.update(comment_count=_count(Comment.objects.all(), 'post'))
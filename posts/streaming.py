@@ -0,0 +1,91 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import RequestContext
+from django.template.loader import get_template, render_to_string
+
+
+ITEM_TEMPLATE = 'post_item.html'
+PAGER_TEMPLATE = 'feed_pager.html'
+
+
+def fragment_cache():
+    """Тот же кэш, что выбирает тег {% cache %}."""
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def stream_feed(request, template_name, context):
+    """
+    Части HTML ленты: сначала страница до списка записей, затем каждая
+    запись по мере рендера, затем страница до навигации, навигация и
+    остаток страницы. Страница вокруг списка рендерится сразу, до
+    ответа, чтобы middleware (CSRF, сообщения) увидели, что она
+    использовала; список и навигация заменены метками. Страница
+    записей в context ленивая (paginate(lazy=True)): ни выборка, ни
+    COUNT(*) не задерживают шапку.
+    """
+    marker = f'feed-stream-{uuid4().hex}'
+    pager_marker = f'feed-pager-{uuid4().hex}'
+    html = render_to_string(template_name, {
+        **context,
+        'feed_stream_marker': marker,
+        'feed_pager_marker': pager_marker,
+    }, request)
+    head, tail = html.split(marker, 1)
+    middle, tail = tail.split(pager_marker, 1)
+    return _chunks(request, context, head, middle, tail)
+
+
+def _chunks(request, context, head, middle, tail):
+    yield head
+    yield from _items(request, context)
+    yield middle
+    yield render_to_string(PAGER_TEMPLATE, context, request)
+    yield tail
+
+
+def _items(request, context):
+    # Готовый список записей берётся из кэша фрагментов и кладётся
+    # в него под тем же ключом, что и у {% cache %} в feed_items.html.
+    key = None
+    if context.get('feed_cache_key'):
+        key = make_template_fragment_key(
+            'feed_page', [context['feed_cache_key']]
+        )
+        cached = fragment_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+    item = get_template(ITEM_TEMPLATE).template
+    item_context = RequestContext(request, context)
+    chunks = []
+    with item_context.bind_template(item):
+        for post in context['page']:
+            with item_context.push(post=post):
+                chunk = item.render(item_context)
+            chunks.append(chunk)
+            yield chunk
+    if key is not None:
+        fragment_cache().set(
+            key, ''.join(chunks), context['feed_cache_timeout']
+        )
+
+
+def render_feed(request, template_name, context):
+    """
+    render() для лент. С FEED_STREAMING = True первый байт уходит
+    до выборки записей, а сами записи отдаются по одной.
+    """
+    if not settings.FEED_STREAMING:
+        return render(request, template_name, context)
+    return StreamingHttpResponse(
+        stream_feed(request, template_name, context),
+        content_type='text/html; charset=utf-8',
+    )
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from django.db import OperationalError, connection
+
+from .models import Comment, Post, User
+
+
+def _worker(action, stop, counters, lock):
+    done = errors = 0
+    try:
+        while time.monotonic() < stop:
+            try:
+                action()
+                done += 1
+            except OperationalError:
+                errors += 1
+    finally:
+        connection.close()
+        with lock:
+            counters[0] += done
+            counters[1] += errors
+
+
+def run(seconds=5.0, readers=4, writers=2):
+    """
+    Читатели листают ленту и комментарии записи, писатели добавляют
+    комментарии, все в своих потоках и соединениях. Возвращает
+    операции в секунду и число ошибок "database is locked".
+    """
+    post = Post.objects.order_by('-pk').first()
+    author_ids = list(User.objects.values_list('pk', flat=True)[:50])
+
+    def read():
+        list(Post.objects.for_feed()[:10])
+        list(Comment.objects.filter(post=post).select_related('author')[:20])
+
+    def write():
+        Comment.objects.create(
+            post=post, author_id=author_ids[0], text='stress'
+        )
+
+    stop = time.monotonic() + seconds
+    lock = threading.Lock()
+    counters = {'read': [0, 0], 'write': [0, 0]}
+    threads = [
+        threading.Thread(
+            target=_worker, args=(read, stop, counters['read'], lock)
+        )
+        for _ in range(readers)
+    ] + [
+        threading.Thread(
+            target=_worker, args=(write, stop, counters['write'], lock)
+        )
+        for _ in range(writers)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    return {
+        'reads_per_sec': round(counters['read'][0] / elapsed, 1),
+        'writes_per_sec': round(counters['write'][0] / elapsed, 1),
+        'read_errors': counters['read'][1],
+        'write_errors': counters['write'][1],
+    }
@@ -0,0 +1,124 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+from posts.pagination import CursorPaginator
+
+
+class ReadApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(
+            username='writer', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Test text:{i}', author=cls.author,
+                group=cls.group if i % 2 else None,
+            )
+            for i in range(5)
+        ]
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.user, text='comment'
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def get(self, name, *args, **params):
+        return self.client.get(reverse(f'api_v1:{name}', args=args), params)
+
+    def test_post_list_walks_by_cursor(self):
+        """Список записей листается курсором без повторов"""
+        texts = []
+        url = reverse('api_v1:post_list') + '?limit=2'
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 2)
+            texts.extend(post['text'] for post in data['results'])
+            url = data['next']
+        self.assertEqual(texts, [f'Test text:{i}' for i in range(4, -1, -1)])
+
+    def test_stale_previous_cursor(self):
+        """Курсор назад дальше самой новой записи отдаёт первую страницу"""
+        first = self.get('post_list', limit=2).json()
+        newest = Post.objects.order_by('-pub_date', '-pk').first()
+        cursor = CursorPaginator(Post.objects.all(), 2).cursor_for(
+            newest, 'prev'
+        )
+        response = self.get('post_list', limit=2, cursor=cursor)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], first['results'])
+
+    def test_embedded_author_and_group(self):
+        """Автор и группа встроены и выбираются одним запросом"""
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('post_list').json()
+        self.assertEqual(len(queries), 1)
+        post = data['results'][1]
+        self.assertEqual(post['author'], {
+            'id': self.author.pk,
+            'username': 'writer',
+            'full_name': 'Лев Толстой',
+        })
+        self.assertEqual(post['group']['slug'], 'group-group')
+        self.assertIsNone(data['results'][0]['group'])
+        self.assertEqual(data['results'][-1]['comment_count'], 1)
+
+    def test_sparse_fields(self):
+        """fields= оставляет только запрошенные поля"""
+        data = self.get('post_detail', self.posts[0].pk, fields='id,text')
+        self.assertEqual(data.json(), {
+            'id': self.posts[0].pk, 'text': 'Test text:0',
+        })
+        response = self.get('post_list', fields='id,secret')
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_and_details(self):
+        """Фильтры списка, группы и комментарии"""
+        data = self.get('post_list', group='group-group').json()
+        self.assertEqual(len(data['results']), 2)
+        data = self.get('group_detail', 'group-group').json()
+        self.assertEqual(data['title'], 'Test group')
+        data = self.get('comment_list', self.posts[0].pk).json()
+        self.assertEqual(data['results'][0]['author']['username'], 'reader')
+        comment_id = data['results'][0]['id']
+        data = self.get('comment_detail', comment_id, fields='post').json()
+        self.assertEqual(data, {'post': self.posts[0].pk})
+        self.assertEqual(len(self.get('group_list').json()['results']), 1)
+
+    def test_not_found_is_json(self):
+        """Несуществующий объект — 404 в JSON"""
+        response = self.get('post_detail', 100500)
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('detail', response.json())
+
+    def test_follow_feed(self):
+        """Лента подписок только для авторизованных"""
+        self.assertEqual(self.get('follow_feed').status_code, 401)
+        self.client.force_login(self.user)
+        self.assertEqual(self.get('follow_feed').json()['results'], [])
+        Follow.objects.follow(self.user, self.author)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('follow_feed', fields='id', limit=3).json()
+        self.assertEqual(
+            [item['id'] for item in data['results']],
+            [post.pk for post in self.posts[:-4:-1]],
+        )
+        sql = queries[-1]['sql']
+        self.assertIn('ORDER BY "timeline_date" DESC', sql)
+        self.assertNotIn('"auth_user"', sql)
+        data = self.client.get(data['next']).json()
+        self.assertEqual(
+            [item['id'] for item in data['results']],
+            [post.pk for post in self.posts[1::-1]],
+        )
@@ -0,0 +1,130 @@
+import base64
+import json
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import (
+    Comment, Follow, Group, Post, SearchToken, TimelineEntry, User,
+    UserStats,
+)
+
+
+class WriteApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='writer', password='secret-password'
+        )
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(WriteApiTest.author)
+
+    def post(self, name, items, client=None, **extra):
+        return (client or self.client).post(
+            reverse(f'api_v1:{name}'),
+            json.dumps(items),
+            content_type='application/json',
+            **extra
+        )
+
+    def test_create_posts(self):
+        """Пачка записей создаётся вместе с производными данными"""
+        response = self.post('post_batch', [
+            {'text': 'Первая кошка', 'group': self.group.pk},
+            {'text': 'Вторая кошка'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        results = response.json()['results']
+        self.assertEqual(
+            [post['text'] for post in results],
+            ['Первая кошка', 'Вторая кошка'],
+        )
+        self.assertEqual(results[0]['group']['slug'], 'group-group')
+        self.assertEqual(results[1]['author']['username'], 'writer')
+        self.assertEqual(UserStats.objects.get(user=self.author).post_count, 2)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.reader).count(), 2
+        )
+        self.assertTrue(SearchToken.objects.filter(
+            post=results[0]['id'], token='кошк'
+        ).exists())
+
+    def test_errors_reported_per_item(self):
+        """Ошибки указывают элемент; при ошибке ничего не создаётся"""
+        response = self.post('post_batch', [
+            {'text': 'ok'},
+            {'text': ''},
+            {'text': 'x', 'group': 100500},
+            'text',
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 2, 3])
+        self.assertIn('text', errors[0]['errors'])
+        self.assertIn('group', errors[1]['errors'])
+        self.assertFalse(Post.objects.exists())
+
+    def test_create_comments(self):
+        """Комментарии создаются пачкой, неизвестная запись — ошибка"""
+        post = Post.objects.create(text='Test text', author=self.author)
+        response = self.post('comment_batch', [
+            {'post': 100500, 'text': 'x'},
+        ])
+        self.assertEqual(response.json()['errors'][0]['errors'], {
+            'post': ['Запись не найдена'],
+        })
+        response = self.post('comment_batch', [
+            {'post': post.pk, 'text': f'comment {i}'} for i in range(3)
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertEqual(Comment.objects.filter(post=post).count(), 3)
+
+    def test_comment_post_must_be_id(self):
+        """Неверный тип post — ошибка элемента, а не 500"""
+        response = self.post('comment_batch', [
+            {'post': [1], 'text': 'x'},
+            {'post': True, 'text': 'x'},
+            {'post': '1', 'text': 'x'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([error['index'] for error in errors], [0, 1, 2])
+        for error in errors:
+            self.assertEqual(error['errors'], {'post': ['Ожидается id записи']})
+
+    def test_authentication(self):
+        """Без входа 401, HTTP Basic работает без сессии"""
+        response = self.post('post_batch', [{'text': 'x'}], client=Client())
+        self.assertEqual(response.status_code, 401)
+        credentials = base64.b64encode(b'writer:secret-password').decode()
+        response = self.post(
+            'post_batch', [{'text': 'x'}],
+            client=Client(enforce_csrf_checks=True),
+            HTTP_AUTHORIZATION=f'Basic {credentials}',
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_session_requires_csrf(self):
+        """Запрос по сессии без CSRF-токена отклоняется"""
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.author)
+        response = self.post('post_batch', [{'text': 'x'}], client=client)
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_bad_payload(self):
+        """Не массив или слишком большая пачка — 400"""
+        self.assertEqual(self.post('post_batch', {}).status_code, 400)
+        with self.settings(API_MAX_BATCH=1):
+            response = self.post('post_batch', [{'text': 'a'}, {'text': 'b'}])
+        self.assertEqual(response.status_code, 400)
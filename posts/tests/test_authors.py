@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.authors import author_context, load_author
+from posts.models import Follow, Post, User
+
+
+class AuthorContextTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='writer')
+        cls.post = Post.objects.create(text='Test text', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(AuthorContextTest.user)
+
+    def request(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return request
+
+    def test_memo_and_cache(self):
+        """Автор читается одним запросом, дальше — из памяти и кэша"""
+        request = self.request()
+        with CaptureQueriesContext(connection) as queries:
+            author = load_author(request, 'writer')
+            load_author(request, 'writer')
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(author['profile'], self.author)
+        self.assertEqual(author['post_count'], 1)
+        self.assertFalse(author['following'])
+        with CaptureQueriesContext(connection) as queries:
+            load_author(self.request(), 'writer')
+        self.assertEqual(len(queries), 0)
+        self.assertIsNone(load_author(self.request(), 'nobody'))
+
+    def test_cache_holds_plain_values(self):
+        """В кэше только простые значения, без объекта User и пароля"""
+        load_author(self.request(), 'writer')
+        values = cache.get(f'author-context:{self.author.pk}')
+        self.assertNotIn('password', values)
+        for value in values.values():
+            self.assertIsInstance(value, (int, str))
+
+    def test_recreated_user_not_stale(self):
+        """Новый пользователь с тем же именем сбрасывает старое имя -> id"""
+        cache.set('author-id:newbie', 999999)
+        newbie = User.objects.create(username='newbie')
+        author = load_author(self.request(), 'newbie')
+        self.assertEqual(author['profile'].pk, newbie.pk)
+
+    def test_context_for_loaded_author(self):
+        """Для загруженного автора пользователь повторно не читается"""
+        with CaptureQueriesContext(connection) as queries:
+            author = author_context(self.request(), self.author)
+        self.assertIs(author['profile'], self.author)
+        self.assertEqual(author['post_count'], 1)
+        self.assertFalse(any(
+            query['sql'].startswith('SELECT "auth_user"')
+            for query in queries
+        ))
+
+    def test_invalidated_on_follow_and_post(self):
+        """Подписка и новая запись сбрасывают кэш автора"""
+        load_author(self.request(), 'writer')
+        Follow.objects.follow(self.user, self.author)
+        Post.objects.create(text='New text', author=self.author)
+        author = load_author(self.request(), 'writer')
+        self.assertTrue(author['following'])
+        self.assertEqual(author['followers'], 1)
+        self.assertEqual(author['post_count'], 2)
+        self.assertEqual(load_author(self.request(), 'reader')['follows'], 1)
+
+    def test_post_view_checks_author(self):
+        """Запись ищется вместе с автором из адреса"""
+        url = reverse('post', kwargs={
+            'username': 'reader', 'post_id': self.post.pk,
+        })
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse('post', kwargs={
+            'username': 'writer', 'post_id': self.post.pk,
+        })
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.context['profile'], self.author)
+        post_queries = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT "posts_post"')
+        ]
+        self.assertEqual(len(post_queries), 1)
+        self.assertIn('"auth_user"."username" =', post_queries[0])
@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from posts import benchmark
+from posts.models import Post, TimelineEntry
+
+
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THUMBNAIL_ASYNC=False)
+class BenchmarkTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        benchmark.seed(users=5, posts=20, follow_density=0.5, comments=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_seed_builds_derived_data(self):
+        """Синтетические данные заполняют ленты подписок"""
+        self.assertEqual(Post.objects.count(), 20)
+        self.assertTrue(TimelineEntry.objects.exists())
+
+    def test_run_measures_every_route(self):
+        """Прогон возвращает метрики для всех маршрутов"""
+        routes = benchmark.run(requests=2, warmup=0)
+        for name in ('index', 'group', 'profile', 'post', 'follow_index',
+                     'add_comment', 'signup'):
+            with self.subTest(route=name):
+                self.assertIn(name, routes)
+                self.assertLess(max(routes[name]['status']), 500)
+                for metric in ('p50_ms', 'p95_ms', 'queries',
+                               'peak_memory_kb'):
+                    self.assertIn(metric, routes[name])
+
+    def test_compare_reports_regressions(self):
+        """Рост числа запросов и p95 выше допуска — регрессия"""
+        before = {'routes': {'index': {
+            'queries': 3, 'p95_ms': 10.0, 'peak_memory_kb': 100.0,
+        }}}
+        now = {'routes': {'index': {
+            'queries': 4, 'p95_ms': 11.0, 'peak_memory_kb': 100.0,
+        }}}
+        regressions = benchmark.compare(now, before, tolerance=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('запросов 3 -> 4', regressions[0])
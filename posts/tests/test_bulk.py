@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import (
+    Comment, Follow, Group, Post, TimelineEntry, User, UserStats,
+)
+
+
+class BulkImportExportTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='writer')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        for i in range(5):
+            post = Post.objects.create(
+                text=f'Test text:{i}', author=cls.author, group=cls.group
+            )
+            Comment.objects.create(post=post, author=cls.user, text='comment')
+        Follow.objects.create(user=cls.user, author=cls.author)
+        cls.post_id = post.pk
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def run_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(*args, stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        """Выгруженные данные загружаются обратно с теми же датами"""
+        dates = dict(Post.objects.values_list('text', 'pub_date'))
+        files = {
+            'post': self.path('posts.jsonl'),
+            'comment': self.path('comments.csv'),
+            'follow': self.path('follows.jsonl'),
+        }
+        for model, path in files.items():
+            output = self.run_command('export_data', model, path)
+            self.assertIn('строк/с', output)
+        Post.objects.all().delete()
+        Follow.objects.all().delete()
+        for model, path in files.items():
+            output = self.run_command(
+                'import_data', model, path, batch_size=2
+            )
+            self.assertIn('Записано', output)
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(Comment.objects.count(), 5)
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(
+            dict(Post.objects.values_list('text', 'pub_date')), dates
+        )
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 5)
+        self.assertEqual(TimelineEntry.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(UserStats.objects.get(user=self.author).post_count, 5)
+
+    def test_existing_rows_not_counted_as_written(self):
+        """Повторная загрузка не считает уже имеющиеся строки записанными"""
+        path = self.path('follows.jsonl')
+        self.run_command('export_data', 'follow', path)
+        output = self.run_command(
+            'import_data', 'follow', path, skip_rebuild=True
+        )
+        self.assertIn('Записано 0 строк', output)
+        self.assertIn('уже были в базе 1', output)
+
+    def test_unknown_references_are_skipped(self):
+        """Строки с неизвестным автором или записью пропускаются"""
+        path = self.path('comments.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('{"post": 100500, "author": "reader", "text": "x"}\n')
+            stream.write('{"post": 1, "author": "nobody", "text": "x"}\n')
+        output = self.run_command(
+            'import_data', 'comment', path, skip_rebuild=True
+        )
+        self.assertIn('пропущено 2', output)
+        self.assertEqual(Comment.objects.count(), 5)
+
+    def test_bad_rows_are_skipped(self):
+        """Неверные строки пропускаются с причиной, остальные загружаются"""
+        path = self.path('comments.csv')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('post,author,text,created\n')
+            stream.write(f'{self.post_id},reader,ok,\n')
+            stream.write(f'{self.post_id},reader,,\n')
+            stream.write('abc,reader,x,\n')
+            stream.write(f'{self.post_id},reader,x,вчера\n')
+            stream.write(f'{self.post_id},reader,ok again,\n')
+        output = self.run_command(
+            'import_data', 'comment', path, batch_size=2, skip_rebuild=True
+        )
+        self.assertIn('Записано 2 строк, пропущено 3', output)
+        self.assertIn('Нет поля text: 1 (первая — строка 2)', output)
+        self.assertIn('post: ожидается число: 1 (первая — строка 3)', output)
+        self.assertIn('created: неверная дата: 1', output)
+        self.assertEqual(Comment.objects.count(), 7)
+
+    def test_bad_json_lines_are_skipped(self):
+        """Битые строки JSON и строки без полей не обрывают загрузку"""
+        path = self.path('posts.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('{"author": "writer"}\n')
+            stream.write('not json\n')
+            stream.write('[1, 2]\n')
+            stream.write('{"author": ["writer"], "text": "x"}\n')
+            stream.write('{"author": "writer", "text": "new"}\n')
+        output = self.run_command(
+            'import_data', 'post', path, skip_rebuild=True
+        )
+        self.assertIn('Записано 1 строк, пропущено 4', output)
+        self.assertIn('Ожидается объект JSON: 2 (первая — строка 2)', output)
+        self.assertTrue(Post.objects.filter(text='new').exists())
@@ -0,0 +1,75 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import bulk
+from posts.models import Comment, Post, User
+
+
+class CommentCountTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.post = Post.objects.create(text='Test text', author=cls.user)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(CommentCountTest.user)
+
+    def comment_count(self):
+        return Post.objects.get(pk=CommentCountTest.post.pk).comment_count
+
+    def add_comment(self, text='comment'):
+        self.authorized_client.post(
+            reverse('add_comment', kwargs={
+                'username': 'testuser',
+                'post_id': CommentCountTest.post.pk,
+            }),
+            {'text': text},
+        )
+
+    def test_add_comment_increments(self):
+        """Новый комментарий увеличивает счётчик записи"""
+        self.add_comment()
+        self.add_comment()
+        self.assertEqual(self.comment_count(), 2)
+
+    def test_delete_comment_decrements(self):
+        """Удаление комментария уменьшает счётчик, но не ниже нуля"""
+        self.add_comment()
+        Comment.objects.get().delete()
+        self.assertEqual(self.comment_count(), 0)
+        Comment.objects.create(
+            post=CommentCountTest.post, author=CommentCountTest.user, text='x'
+        )
+        Post.objects.filter(pk=CommentCountTest.post.pk).update(comment_count=0)
+        Comment.objects.get().delete()
+        self.assertEqual(self.comment_count(), 0)
+
+    def test_post_edit_keeps_count(self):
+        """Сохранение записи не затирает счётчик прочитанным ранее значением"""
+        post = Post.objects.get(pk=CommentCountTest.post.pk)
+        self.add_comment()
+        post.text = 'Edited text'
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.text, 'Edited text')
+        self.assertEqual(post.comment_count, 1)
+
+    def test_batch_comments_increment(self):
+        """Пачка комментариев через bulk_create тоже учитывается"""
+        bulk.create_comments(CommentCountTest.user, [
+            {'post': CommentCountTest.post.pk, 'text': 'first'},
+            {'post': CommentCountTest.post.pk, 'text': 'second'},
+        ])
+        self.assertEqual(self.comment_count(), 2)
+
+    def test_reconcile_recounts(self):
+        """reconcile_stats пересчитывает разошедшиеся счётчики"""
+        self.add_comment()
+        Post.objects.filter(pk=CommentCountTest.post.pk).update(comment_count=7)
+        call_command('reconcile_stats', stdout=StringIO())
+        self.assertEqual(self.comment_count(), 1)
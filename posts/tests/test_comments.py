@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Post, User
+from posts.pagination import CursorPaginator
+
+
+@override_settings(COMMENTS_PER_PAGE=5)
+class CommentPaginationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.post = Post.objects.create(text='Test text', author=cls.author)
+        for i in range(12):
+            user = User.objects.create(username=f'reader{i}')
+            Comment.objects.create(
+                post=cls.post, author=user, text=f'Comment:{i}'
+            )
+        cls.post_url = reverse('post', kwargs={
+            'username': 'author', 'post_id': cls.post.pk,
+        })
+        cls.fragment_url = reverse('post_comments', kwargs={
+            'username': 'author', 'post_id': cls.post.pk,
+        })
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_post_shows_first_page(self):
+        """На странице записи только первая пачка новых комментариев"""
+        response = self.client.get(self.post_url)
+        comments = response.context['comments_page']
+        self.assertEqual(
+            [comment.text for comment in comments],
+            [f'Comment:{i}' for i in range(11, 6, -1)],
+        )
+        self.assertTrue(comments.has_next())
+        self.assertContains(response, self.fragment_url + '?cursor=')
+
+    def test_fragment_walks_all_comments(self):
+        """Фрагменты по курсору отдают все комментарии без повторов"""
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(self.fragment_url, {'cursor': cursor})
+            comments = response.context['comments_page']
+            seen.extend(comment.text for comment in comments)
+            if not comments.has_next():
+                break
+            cursor = comments.next_cursor()
+        self.assertEqual(seen, [f'Comment:{i}' for i in range(11, -1, -1)])
+        self.assertNotContains(response, 'Показать ещё')
+
+    def test_authors_are_joined(self):
+        """Авторы комментариев выбираются тем же запросом"""
+        self.client.get(self.fragment_url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.fragment_url)
+        self.assertEqual(len(queries), 2)
+
+    def test_fragment_checks_author(self):
+        """Фрагмент чужой записи возвращает 404"""
+        url = reverse('post_comments', kwargs={
+            'username': 'reader0', 'post_id': self.post.pk,
+        })
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_stale_previous_cursor(self):
+        """Курсор назад дальше самого нового комментария не ломает страницу"""
+        newest = Comment.objects.order_by('-created', '-pk').first()
+        cursor = CursorPaginator(
+            Comment.objects.all(), 5, ordering=('-created', '-pk')
+        ).cursor_for(newest, 'prev')
+        for url, param in ((self.post_url, 'comments'),
+                           (self.fragment_url, 'cursor')):
+            response = self.client.get(url, {param: cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.context['comments_page'][0].text, 'Comment:11'
+            )
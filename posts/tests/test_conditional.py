@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+
+
+@override_settings(FEED_CACHE_SHARED=True)
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.author = User.objects.create(username='author')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        cls.post = Post.objects.create(
+            text='Test text', author=cls.author, group=cls.group
+        )
+        cls.urls = [
+            reverse('index'),
+            reverse('group', kwargs={'slug': 'group-group'}),
+            reverse('profile', kwargs={'username': 'author'}),
+            reverse('post', kwargs={
+                'username': 'author', 'post_id': cls.post.pk,
+            }),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(ConditionalGetTest.user)
+
+    def revalidate(self, url, response):
+        return self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+    def test_not_modified_without_post_queries(self):
+        """Совпавший ETag даёт 304 без выборки записей и шаблонов"""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                with CaptureQueriesContext(connection) as queries:
+                    with self.assertTemplateNotUsed('base.html'):
+                        response = self.revalidate(url, response)
+                self.assertEqual(response.status_code, 304)
+                for query in queries:
+                    self.assertNotIn('posts_post', query['sql'])
+
+    def test_if_modified_since(self):
+        """Last-Modified сверяется с If-Modified-Since"""
+        Post.objects.create(text='New text', author=self.author)
+        response = self.client.get(self.urls[0])
+        response = self.client.get(
+            self.urls[0],
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate_etag(self):
+        """Новая запись, комментарий или подписка меняют ETag"""
+        changes = [
+            lambda: Post.objects.create(text='New text', author=self.author),
+            lambda: Comment.objects.create(
+                post=self.post, author=self.user, text='comment'
+            ),
+            lambda: Follow.objects.follow(self.user, self.author),
+        ]
+        for change in changes:
+            responses = {url: self.client.get(url) for url in self.urls}
+            change()
+            for url, response in responses.items():
+                with self.subTest(url=url):
+                    self.assertEqual(
+                        self.revalidate(url, response).status_code, 200
+                    )
+
+    def test_etag_depends_on_viewer_and_page(self):
+        """ETag разный для разных зрителей и страниц"""
+        url = self.urls[0]
+        etag = self.client.get(url)['ETag']
+        self.assertNotEqual(Client().get(url)['ETag'], etag)
+        self.assertNotEqual(self.client.get(url, {'page': 2})['ETag'], etag)
+        self.assertEqual(self.client.get(url, {'x': 1})['ETag'], etag)
+
+    @override_settings(FEED_CACHE_SHARED=False)
+    def test_no_validators_without_shared_cache(self):
+        """Без общего кэша поколений ETag и Last-Modified не выдаются"""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertFalse(response.has_header('ETag'))
+                self.assertFalse(response.has_header('Last-Modified'))
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 200)
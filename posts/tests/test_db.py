@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from posts import stress
+from posts.db import pragmas
+from posts.models import Post, User
+
+
+@skipUnless(connection.vendor == 'sqlite', 'PRAGMA есть только у SQLite')
+class SqlitePragmasTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        self.wrapper = DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': os.path.join(self.directory, 'pragmas.sqlite3'),
+        }, alias='pragmas')
+
+    def tearDown(self):
+        self.wrapper.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_tuned_pragmas_applied_on_connect(self):
+        """Настройки применяются к каждому новому соединению"""
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_TUNED_PRAGMAS):
+            applied = pragmas(self.wrapper)
+        self.assertEqual(applied['journal_mode'], 'wal')
+        self.assertEqual(applied['synchronous'], 1)
+        self.assertEqual(applied['busy_timeout'], 5000)
+        self.assertEqual(applied['cache_size'], -20000)
+
+    def test_defaults_untouched(self):
+        """Без профиля соединение остаётся со значениями SQLite"""
+        self.assertEqual(pragmas(self.wrapper)['journal_mode'], 'delete')
+
+
+class StressTest(TransactionTestCase):
+    def test_readers_and_writers(self):
+        """Нагрузка идёт в потоках, блокировки считаются, а не падают"""
+        # Тестовая база SQLite в памяти блокирует таблицы целиком, так что
+        # сравнение профилей — дело команды dbstress на файловой базе.
+        user = User.objects.create(username='testuser')
+        Post.objects.create(text='Test text', author=user)
+        result = stress.run(seconds=0.3, readers=2, writers=1)
+        self.assertEqual(set(result), {
+            'reads_per_sec', 'writes_per_sec', 'read_errors', 'write_errors',
+        })
+        self.assertGreater(
+            result['reads_per_sec'] + result['writes_per_sec'], 0
+        )
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class SyndicationFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.other = User.objects.create(username='other')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        Post.objects.create(
+            text='Group text', author=cls.author, group=cls.group
+        )
+        Post.objects.create(text='Other text', author=cls.other)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_atom_feeds(self):
+        """Atom-ленты: общая, группы и автора"""
+        feeds = {
+            reverse('index_atom'): ('Group text', 'Other text'),
+            reverse('group_atom', args=['group-group']): ('Group text',),
+            reverse('profile_atom', args=['other']): ('Other text',),
+        }
+        for url, texts in feeds.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('application/atom+xml', response['Content-Type'])
+                content = response.content.decode()
+                for text in ('Group text', 'Other text'):
+                    self.assertEqual(text in content, text in texts)
+
+    def test_json_feed(self):
+        """JSON Feed с автором и группой записи"""
+        response = self.client.get(
+            reverse('group_json', args=['group-group'])
+        )
+        self.assertIn('application/feed+json', response['Content-Type'])
+        document = response.json()
+        self.assertEqual(document['title'], 'Yatube: Test group')
+        item, = document['items']
+        self.assertEqual(item['content_text'], 'Group text')
+        self.assertEqual(item['tags'], ['Test group'])
+        self.assertEqual(item['authors'][0]['name'], 'author')
+
+    def test_unknown_group_or_author(self):
+        """Лента несуществующей группы или автора — 404"""
+        for url in (reverse('group_json', args=['missing']),
+                    reverse('profile_atom', args=['missing'])):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_cached_until_post_changes(self):
+        """Документ берётся из кэша, пока записи не изменятся"""
+        url = reverse('index_json')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(len(response.json()['items']), 2)
+        Post.objects.create(text='New text', author=self.author)
+        self.assertEqual(len(self.client.get(url).json()['items']), 3)
+
+    def test_extra_params_share_cache_entry(self):
+        """Лишние параметры адреса не заводят новых записей в кэше"""
+        url = reverse('index_json')
+        self.client.get(url, {'x': 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'x': 2})
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(FEED_CACHE_SHARED=True)
+    def test_conditional_get(self):
+        """Совпавший ETag или дата дают 304"""
+        url = reverse('index_atom')
+        Post.objects.create(text='New text', author=self.author)
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code, 304)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code, 304)
+        with override_settings(FEED_CACHE_SHARED=False):
+            response = self.client.get(url)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Follow, User
+
+
+SUBSCRIPTION_URL = reverse(
+    'profile_subscription', kwargs={'username': 'author'}
+)
+
+
+class FollowTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.author = User.objects.create(username='author')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(FollowTest.user)
+
+    def test_follow_is_idempotent(self):
+        """Повторная подписка не создаёт дубликат"""
+        self.assertTrue(Follow.objects.follow(self.user, self.author))
+        self.assertFalse(Follow.objects.follow(self.user, self.author))
+        self.assertEqual(Follow.objects.filter(user=self.user).count(), 1)
+
+    def test_follow_single_insert(self):
+        """Подписка — один INSERT без предварительной проверки"""
+        with CaptureQueriesContext(connection) as queries:
+            Follow.objects.follow(self.user, self.author)
+        follow_queries = [
+            query['sql'] for query in queries
+            if 'posts_follow' in query['sql']
+        ]
+        self.assertEqual(len(follow_queries), 1)
+        self.assertTrue(follow_queries[0].startswith('INSERT'))
+
+    def test_cannot_follow_self(self):
+        """Нельзя подписаться на самого себя"""
+        self.assertFalse(Follow.objects.follow(self.user, self.user))
+
+    def test_unfollow_is_idempotent(self):
+        """Повторная отписка ничего не ломает"""
+        Follow.objects.follow(self.user, self.author)
+        self.assertTrue(Follow.objects.unfollow(self.user, self.author))
+        self.assertFalse(Follow.objects.unfollow(self.user, self.author))
+
+    def test_subscription_json(self):
+        """JSON-эндпоинт подписывает и отписывает"""
+        response = self.authorized_client.post(SUBSCRIPTION_URL)
+        self.assertEqual(response.json(), {
+            'username': 'author', 'following': True, 'followers': 1,
+        })
+        response = self.authorized_client.delete(SUBSCRIPTION_URL)
+        self.assertEqual(response.json(), {
+            'username': 'author', 'following': False, 'followers': 0,
+        })
+        self.assertFalse(Follow.objects.exists())
+
+    def test_subscription_json_requires_login(self):
+        """Гостю JSON-эндпоинт отвечает 401"""
+        response = self.guest_client.post(SUBSCRIPTION_URL)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,60 @@
+from unittest import skipUnless
+
+from django.db import connection, IntegrityError, transaction
+from django.test import TestCase
+
+from posts import timeline
+from posts.models import Comment, Follow, Group, Post, User
+
+
+@skipUnless(connection.vendor == 'sqlite', 'План запроса в формате SQLite')
+class FeedIndexTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.author = User.objects.create(username='author')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        cls.post = Post.objects.create(
+            text='Test text', author=cls.author, group=cls.group
+        )
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+
+    def test_feed_queries_use_indexes(self):
+        """Запросы лент читают записи по своим индексам"""
+        feeds = {
+            'post_pub_date_idx': Post.objects.for_feed(),
+            'post_group_pub_date_idx':
+                Post.objects.for_feed().filter(group=self.group),
+            'post_author_pub_date_idx':
+                Post.objects.for_feed().filter(author=self.author),
+            'comment_post_created_idx':
+                Comment.objects.filter(post=self.post),
+        }
+        for index, queryset in feeds.items():
+            with self.subTest(index=index):
+                self.assertUsesIndex(queryset[:10], index)
+
+    def test_follow_feed_uses_timeline_index(self):
+        """Лента подписок выбирается по индексу ленты пользователя"""
+        plan = timeline.feed(self.user.id)[:10].explain()
+        self.assertIn('SEARCH posts_timelineentry USING INDEX', plan)
+        self.assertIn('(user_id=?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_follow_lookup_and_uniqueness(self):
+        """Пара (user, author) в Follow уникальна и ищется по индексу"""
+        Follow.objects.create(user=self.user, author=self.author)
+        plan = Follow.objects.filter(
+            user=self.user, author=self.author
+        ).explain()
+        self.assertIn('(user_id=? AND author_id=?)', plan)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Follow.objects.create(user=self.user, author=self.author)
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class InstrumentationMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        Post.objects.create(text='Test text', author=cls.user, group=cls.group)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        self.path = os.path.join(self.directory, 'perf.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def get(self, url, **overrides):
+        overrides.setdefault('PERF_INSTRUMENTATION', True)
+        overrides.setdefault('PERF_SAMPLE_RATE', 1.0)
+        with override_settings(PERF_SAMPLES_PATH=self.path, **overrides):
+            with self.assertLogs('posts.perf', 'INFO') as logs:
+                response = Client().get(url)
+        return response, logs
+
+    def test_server_timing_and_log(self):
+        """Ответ содержит Server-Timing, замер пишется строкой JSON"""
+        response, logs = self.get(reverse('index'))
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'tpl;dur=', 'cache;desc=', 'total;dur='):
+            self.assertIn(metric, timing)
+        sample = json.loads(logs.records[0].getMessage())
+        self.assertEqual(sample['url_name'], 'index')
+        self.assertGreater(sample['queries'], 0)
+        self.assertGreater(sample['template_ms'], 0)
+        self.assertTrue(sample['slow_sql'])
+
+    def test_streamed_body_is_measured(self):
+        """Запросы и рендер тела потоковой ленты попадают в замер"""
+        overrides = {
+            'PERF_INSTRUMENTATION': True,
+            'PERF_SAMPLE_RATE': 0,
+            'FEED_STREAMING': True,
+        }
+        with override_settings(**overrides):
+            with CaptureQueriesContext(connection) as queries:
+                response = Client().get(reverse('index'))
+                with self.assertLogs('posts.perf', 'INFO') as logs:
+                    body = b''.join(response.streaming_content).decode()
+        self.assertIn('Test text', body)
+        sample = json.loads(logs.records[0].getMessage())
+        self.assertEqual(sample['queries'], len(queries))
+        self.assertGreater(sample['template_ms'], 0)
+
+    def test_disabled_by_default(self):
+        """Без настройки заголовок не добавляется"""
+        with override_settings(PERF_INSTRUMENTATION=False):
+            response = Client().get(reverse('index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_perfreport_summarizes_samples(self):
+        """perfreport выводит сводку по маршрутам"""
+        self.get(reverse('index'))
+        self.get(reverse('group', kwargs={'slug': 'group-group'}))
+        self.get(reverse('index'), PERF_SAMPLE_RATE=0)
+        out = StringIO()
+        call_command('perfreport', path=self.path, stdout=out)
+        output = out.getvalue()
+        self.assertIn('index', output)
+        self.assertIn('n=1 ', output)
+        self.assertIn('group', output)
+        self.assertIn('Маршрутов: 2', output)
+
+    def test_hook_only_when_enabled(self):
+        """Рендер шаблонов подменяется только при включённых замерах"""
+        code = (
+            'import sys, django; django.setup(); '
+            'from django.core.handlers.wsgi import WSGIHandler; '
+            'WSGIHandler(); '
+            'from django.template.backends.django import Template; '
+            "print(getattr(Template.render, 'instrumented', False), "
+            "'posts.benchmark' in sys.modules)"
+        )
+        for enabled, expected in (('0', 'False False'), ('1', 'True False')):
+            with self.subTest(enabled=enabled):
+                result = subprocess.run(
+                    [sys.executable, '-c', code],
+                    cwd=settings.BASE_DIR,
+                    env={
+                        **os.environ,
+                        'DJANGO_SETTINGS_MODULE': 'yatube.settings',
+                        'YATUBE_PERF': enabled,
+                    },
+                    capture_output=True, text=True, check=True,
+                )
+                self.assertEqual(result.stdout.strip(), expected)
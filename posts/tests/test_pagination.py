@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from posts import timeline
+from posts.models import Follow, Post, User
+from posts.pagination import CursorPage, CursorPaginator
+
+
+INDEX_URL = reverse('index')
+
+
+class CursorPaginationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        for i in range(25):
+            Post.objects.create(text=f'Test text:{i}', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_pages_cover_all_posts_in_order(self):
+        """Курсорные страницы отдают все посты по порядку без повторов"""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_page()
+        seen = list(page)
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor())
+            seen.extend(page)
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(page), 5)
+
+    def test_cursor_by_annotation(self):
+        """Лента подписок листается курсором по дате из TimelineEntry"""
+        reader = User.objects.create(username='reader')
+        Follow.objects.create(user=reader, author=self.user)
+        paginator = CursorPaginator(
+            timeline.feed(reader.id), 10, ordering=timeline.ORDERING
+        )
+        page = paginator.get_page()
+        seen = list(page)
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor())
+            seen.extend(page)
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        self.assertEqual(seen, expected)
+        back = paginator.get_page(page.previous_cursor())
+        self.assertEqual(back[0], expected[10])
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Курсор назад возвращает предыдущую страницу"""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor())
+        back = paginator.get_page(second.previous_cursor())
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_empty_backward_page_returns_first_page(self):
+        """Курсор назад без строк перед ним отдаёт первую страницу"""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        newest = Post.objects.order_by('-pub_date', '-pk').first()
+        cursor = paginator.cursor_for(newest, 'prev')
+        page = paginator.get_page(cursor)
+        self.assertEqual(list(page), list(paginator.get_page()))
+        self.assertFalse(page.has_previous())
+        self.assertIsNotNone(page.next_cursor())
+        response = self.guest_client.get(f'{INDEX_URL}?cursor={cursor}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_empty_page_has_no_cursors(self):
+        """У пустой страницы нет курсоров"""
+        page = CursorPaginator(Post.objects.none(), 10).get_page()
+        page._has_next = page._has_previous = True
+        self.assertIsNone(page.next_cursor())
+        self.assertIsNone(page.previous_cursor())
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Битый курсор отдаёт первую страницу"""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_page('not-a-cursor')
+        self.assertEqual(list(page), list(paginator.get_page()))
+
+    def test_cursor_page_does_not_count(self):
+        """Курсорная страница не выполняет COUNT(*)"""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        with self.assertNumQueries(1):
+            page = paginator.get_page()
+        self.assertEqual(len(page), 10)
+
+    @override_settings(POSTS_CURSOR_PAGINATION=True)
+    def test_index_uses_cursor_page(self):
+        """В курсорном режиме главная страница отдаёт CursorPage"""
+        response = self.guest_client.get(INDEX_URL)
+        page = response.context.get('page')
+        self.assertIsInstance(page, CursorPage)
+        self.assertEqual(len(page), 10)
+        self.assertContains(response, f'?cursor={page.next_cursor()}')
+
+    def test_cursor_param_enables_cursor_mode(self):
+        """Параметр ?cursor= включает курсорный режим"""
+        response = self.guest_client.get(INDEX_URL + '?cursor=')
+        self.assertIsInstance(response.context.get('page'), CursorPage)
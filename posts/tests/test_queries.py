@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+
+
+MAX_FEED_QUERIES = 8
+
+
+class FeedQueryCountTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        for i in range(12):
+            author = User.objects.create(username=f'writer_{i}')
+            Follow.objects.create(user=cls.user, author=author)
+            post = Post.objects.create(
+                text=f'Test text:{i}',
+                author=author,
+                group=cls.group,
+            )
+            Comment.objects.create(post=post, author=cls.user, text='comment')
+        for i in range(12):
+            Post.objects.create(text=f'Own text:{i}', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(FeedQueryCountTest.user)
+
+    def test_feed_pages_query_count(self):
+        """Страница ленты из 10 записей укладывается в фиксированное число запросов"""
+        pages = [
+            reverse('index'),
+            reverse('group', kwargs={'slug': 'group-group'}),
+            reverse('profile', kwargs={'username': 'reader'}),
+            reverse('follow_index'),
+        ]
+        for page in pages:
+            with self.subTest(page=page):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorized_client.get(page)
+                self.assertEqual(len(response.context['page']), 10)
+                self.assertLessEqual(len(queries), MAX_FEED_QUERIES)
+
+    def test_feed_shows_comment_count(self):
+        """Карточка записи показывает число комментариев из поля comment_count"""
+        response = self.authorized_client.get(reverse('follow_index'))
+        self.assertEqual(response.context['page'][0].comment_count, 1)
+        self.assertContains(response, 'Комментариев: 1')
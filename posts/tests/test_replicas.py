@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.replicas import PIN_COOKIE, ReplicaRouter, use_database
+
+
+class ReplicaRoutingTest(TestCase):
+    """
+    Основная база — тестовая, реплика — отдельный файл SQLite
+    с другими данными: по тексту на странице видно, откуда шло чтение.
+    """
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        settings.DATABASES['replica'] = {
+            **connection.settings_dict,
+            'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+        }
+        call_command('migrate', database='replica', verbosity=0)
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        Post.objects.create(text='Текст с основной базы', author=cls.author)
+        replica_author = User.objects.db_manager('replica').create(
+            username='author'
+        )
+        Post.objects.using('replica').bulk_create([
+            Post(text='Текст с реплики', author=replica_author),
+        ])
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del settings.DATABASES['replica']
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_router(self):
+        """Чтение на реплику только внутри use_database, запись — на основную"""
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Post))
+        with use_database('replica'):
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertIsNone(router.db_for_read(Post))
+
+    def test_feeds_read_from_replica(self):
+        """Ленты читаются с реплики"""
+        urls = [
+            reverse('index'),
+            reverse('profile', kwargs={'username': 'author'}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Текст с реплики')
+                self.assertNotContains(response, 'Текст с основной базы')
+
+    @override_settings(FEED_STREAMING=True)
+    def test_streamed_feed_reads_from_replica(self):
+        """Потоковая лента дочитывается с реплики"""
+        response = self.client.get(reverse('index'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Текст с реплики', content)
+
+    def test_user_loaded_from_primary(self):
+        """Сессия и пользователь берутся с основной базы"""
+        response = self.client.get(reverse('index'))
+        self.assertEqual(response.context['user'], self.reader)
+
+    def test_replica_reads_not_cached(self):
+        """Ответ с реплики не попадает в кэш фрагментов и авторов"""
+        self.client.get(reverse('index'))
+        self.client.get(reverse('profile', kwargs={'username': 'author'}))
+        self.assertIsNone(cache.get('author-id:author'))
+        with override_settings(REPLICA_DATABASE='missing'):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Текст с основной базы')
+
+    @override_settings(FEED_CACHE_SHARED=True)
+    def test_no_validators_from_replica(self):
+        """Страница с реплики не получает ETag и Last-Modified"""
+        response = self.client.get(reverse('index'))
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+        with override_settings(REPLICA_DATABASE='missing'):
+            response = self.client.get(reverse('index'))
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_pinned_to_primary_after_write(self):
+        """После записи пользователь читает свои изменения с основной базы"""
+        response = self.client.get(
+            reverse('profile_follow', kwargs={'username': 'author'})
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(
+            response.cookies[PIN_COOKIE]['max-age'],
+            settings.REPLICA_PIN_SECONDS,
+        )
+        response = self.client.get(reverse('follow_index'))
+        self.assertContains(response, 'Текст с основной базы')
+        self.assertNotContains(response, 'Текст с реплики')
+
+    def test_no_pin_without_write(self):
+        """Открыть форму — не запись, закрепления нет"""
+        response = self.client.get(reverse('new'))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    @override_settings(REPLICA_DATABASE='missing')
+    def test_without_replica_reads_primary(self):
+        """Без настроенной реплики всё читается с основной базы"""
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Текст с основной базы')
@@ -0,0 +1,64 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from posts.models import Post, SearchToken, User
+from posts.search import search_ids, stem, tokenize
+
+
+SEARCH_URL = reverse('search')
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.cats = Post.objects.create(
+            text='Кошки гуляют по крышам, кошка спит', author=cls.user
+        )
+        cls.cat = Post.objects.create(
+            text='Рыжая кошка и собака', author=cls.user
+        )
+        cls.dog = Post.objects.create(text='Собаки лают', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_stem_russian_forms(self):
+        """Разные формы русского слова сводятся к одной основе"""
+        self.assertEqual(stem('Кошки'), stem('кошка'))
+        self.assertEqual(stem('ёжик'), stem('ежики'))
+        self.assertNotIn('и', tokenize('кошки и собаки'))
+
+    def test_index_follows_post_changes(self):
+        """Индекс обновляется при изменении и удалении записи"""
+        post = Post.objects.create(text='Уникальное слово', author=self.user)
+        self.assertEqual(search_ids('уникальный'), [post.pk])
+        post.text = 'Другой текст'
+        post.save()
+        self.assertEqual(search_ids('уникальный'), [])
+        post.delete()
+        self.assertFalse(SearchToken.objects.filter(post=post.pk).exists())
+
+    def test_results_are_ranked(self):
+        """Больше совпавших слов и вхождений — выше в выдаче"""
+        self.assertEqual(
+            search_ids('кошка'), [SearchTest.cats.pk, SearchTest.cat.pk]
+        )
+        self.assertEqual(search_ids('рыжая собака')[0], SearchTest.cat.pk)
+
+    def test_search_page(self):
+        """Страница поиска показывает найденные записи"""
+        response = self.guest_client.get(SEARCH_URL, {'q': 'собаки'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'search.html')
+        self.assertEqual(
+            [post.pk for post in response.context['page']],
+            [SearchTest.dog.pk, SearchTest.cat.pk],
+        )
+        self.assertNotContains(response, 'Кошки гуляют')
+
+    def test_empty_query(self):
+        """Пустой запрос ничего не ищет"""
+        response = self.guest_client.get(SEARCH_URL)
+        self.assertEqual(len(response.context['page']), 0)
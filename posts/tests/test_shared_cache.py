@@ -0,0 +1,126 @@
+import shutil
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import (
+    Client, SimpleTestCase, TransactionTestCase, override_settings,
+)
+from django.urls import reverse
+
+from posts import feed_cache
+from posts.cache_backends import DatabaseCache
+from posts.models import Post, User
+
+
+INDEX_URL = reverse('index')
+NEW_URL = reverse('new')
+CACHE_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def in_worker(func):
+    """
+    Выполняет func в отдельном потоке: у потока свои экземпляры
+    бэкендов кэша, как у отдельного воркера gunicorn.
+    """
+    result = {}
+
+    def target():
+        try:
+            result['value'] = func()
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'posts.cache_backends.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        }
+    },
+    CACHE_STATS_FLUSH_EVERY=1,
+)
+class SharedCacheTest(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='testuser')
+        Post.objects.create(text='Old text', author=self.user)
+
+    def get_index(self):
+        return Client().get(INDEX_URL).content.decode()
+
+    def create_post(self):
+        client = Client()
+        client.force_login(self.user)
+        return client.post(NEW_URL, {'text': 'Text from worker B'})
+
+    def test_post_in_one_worker_invalidates_another(self):
+        """Запись, созданная в одном воркере, сбрасывает кэш другого"""
+        self.assertIn('Old text', in_worker(self.get_index))
+        self.assertNotIn('Text from worker B', in_worker(self.get_index))
+        in_worker(self.create_post)
+        self.assertIn('Text from worker B', in_worker(self.get_index))
+
+    def test_hit_rate_is_shared(self):
+        """Счётчики попаданий общие для всех воркеров"""
+        cache.reset_stats()
+        in_worker(self.get_index)
+        in_worker(self.get_index)
+        stats = in_worker(lambda: cache.stats())
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['misses'], 0)
+        self.assertGreater(stats['hit_rate'], 0)
+
+
+@override_settings(CACHE_STATS_FLUSH_EVERY=1000)
+class DatabaseCacheStatsTest(TransactionTestCase):
+    def setUp(self):
+        call_command('createcachetable', 'stats_cache', verbosity=0)
+        self.workers = [
+            DatabaseCache('stats_cache', {}) for _ in range(2)
+        ]
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE stats_cache')
+
+    def test_counters_add_up(self):
+        """Сброс счётчиков из нескольких воркеров прибавляет, а не затирает"""
+        first, second = self.workers
+        for _ in range(3):
+            first.get('missing')
+        second.get('missing')
+        first.set('key', 'value')
+        second.get('key')
+        first.flush_stats()
+        second.flush_stats()
+        self.assertEqual(first.stats()['misses'], 4)
+        self.assertEqual(second.stats()['hits'], 1)
+
+
+class GenerationTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_reseed_never_goes_back(self):
+        """После вытеснения поколение не повторяет выданные раньше"""
+        first = feed_cache.get_generation()
+        for _ in range(1000):
+            last = feed_cache.bump_generation()
+        cache.delete(feed_cache.GENERATION_KEY)
+        self.assertGreater(feed_cache.get_generation(), last)
+        self.assertGreater(last, first)
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from posts.models import Follow, Post, User, UserStats
+
+
+class UserStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='writer')
+        cls.post = Post.objects.create(text='Test text', author=cls.author)
+        Post.objects.create(text='Test text 2', author=cls.author)
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_counters_follow_writes(self):
+        """Счётчики обновляются при создании записей и подписок"""
+        author_stats = UserStats.objects.get(user=UserStatsTest.author)
+        self.assertEqual(author_stats.post_count, 2)
+        self.assertEqual(author_stats.followers_count, 1)
+        self.assertEqual(
+            UserStats.objects.get(user=UserStatsTest.user).following_count, 1
+        )
+
+    def test_counters_follow_deletes(self):
+        """Счётчики уменьшаются при удалении записей и подписок"""
+        Post.objects.filter(pk=UserStatsTest.post.pk).delete()
+        Follow.objects.filter(user=UserStatsTest.user).delete()
+        author_stats = UserStats.objects.get(user=UserStatsTest.author)
+        self.assertEqual(author_stats.post_count, 1)
+        self.assertEqual(author_stats.followers_count, 0)
+
+    def test_profile_reads_counters(self):
+        """Шапка профиля берёт счётчики из UserStats"""
+        response = self.guest_client.get(
+            reverse('profile', kwargs={'username': 'writer'})
+        )
+        self.assertEqual(response.context['post_count'], 2)
+        self.assertEqual(response.context['followers'], 1)
+        self.assertEqual(response.context['follows'], 0)
+
+    def test_reconcile_fixes_drift(self):
+        """Команда reconcile_stats исправляет расхождения"""
+        UserStats.objects.filter(user=UserStatsTest.author).update(
+            post_count=100, followers_count=0
+        )
+        UserStats.objects.filter(user=UserStatsTest.user).delete()
+        call_command('reconcile_stats', stdout=StringIO())
+        author_stats = UserStats.objects.get(user=UserStatsTest.author)
+        self.assertEqual(author_stats.post_count, 2)
+        self.assertEqual(author_stats.followers_count, 1)
+        self.assertEqual(
+            UserStats.objects.get(user=UserStatsTest.user).following_count, 1
+        )
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+@override_settings(FEED_STREAMING=True)
+class StreamingFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='group-group',
+            description='Test description',
+        )
+        for i in range(3):
+            Post.objects.create(
+                text=f'Test text:{i}', author=cls.user, group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(StreamingFeedTest.user)
+
+    def content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_feeds_are_streamed(self):
+        """Ленты отдаются потоком с полной разметкой base.html"""
+        urls = [
+            reverse('index'),
+            reverse('group', kwargs={'slug': 'group-group'}),
+            reverse('profile', kwargs={'username': 'testuser'}),
+            reverse('follow_index'),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(response.streaming)
+                html = self.content(response)
+                self.assertIn('</html>', html)
+                self.assertNotIn('feed-stream-', html)
+        self.assertIn('Test text:2', self.content(self.client.get(urls[0])))
+
+    def test_header_sent_before_posts_query(self):
+        """Шапка страницы отдаётся до выборки записей"""
+        response = self.client.get(reverse('index'))
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as queries:
+            head = next(chunks).decode()
+        self.assertIn('<body', head)
+        self.assertNotIn('Test text', head)
+        self.assertFalse(queries.captured_queries)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn('Test text:2', next(chunks).decode())
+        self.assertTrue(queries.captured_queries)
+
+    @override_settings(POSTS_PER_PAGE=2)
+    def test_page_fetched_after_header(self):
+        """Ни выборка страницы, ни COUNT(*) не задерживают шапку"""
+        for cursor in (False, True):
+            with self.subTest(cursor=cursor), override_settings(
+                POSTS_CURSOR_PAGINATION=cursor
+            ):
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(reverse('index'))
+                    chunks = iter(response.streaming_content)
+                    head = next(chunks).decode()
+                self.assertIn('<body', head)
+                self.assertFalse([
+                    query for query in queries
+                    if 'posts_post' in query['sql']
+                ])
+                rest = b''.join(chunks).decode()
+                self.assertIn('Test text:2', rest)
+                self.assertIn('class="pagination"', rest)
+                self.assertEqual(cursor, '?cursor=' in rest)
+
+    def test_shares_fragment_cache(self):
+        """Потоковый и обычный рендер используют один кэш фрагментов"""
+        self.content(self.client.get(reverse('index')))
+        Post.objects.update(text='Changed text')
+        with override_settings(FEED_STREAMING=False):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Test text:2')
+        cache.clear()
+        with override_settings(FEED_STREAMING=False):
+            self.client.get(reverse('index'))
+        Post.objects.update(text='Other text')
+        self.assertIn(
+            'Changed text', self.content(self.client.get(reverse('index')))
+        )
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts.models import Post, User
+from posts.thumbnails import generate
+
+
+NEW_URL = reverse('new')
+INDEX_URL = reverse('index')
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def get_image_file(name='image.png', size=(100, 60)):
+    buffer = BytesIO()
+    Image.new('RGB', size, (255, 0, 0)).save(buffer, 'png')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ThumbnailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(ThumbnailTest.user)
+
+    def create_post(self):
+        self.authorized_client.post(
+            NEW_URL, {'text': 'Image post', 'image': get_image_file()}
+        )
+        return Post.objects.get(text='Image post')
+
+    @override_settings(THUMBNAIL_ASYNC=False)
+    def test_thumbnail_generated_on_save(self):
+        """Миниатюра готовится при сохранении формы с картинкой"""
+        post = self.create_post()
+        self.assertTrue(post.thumbnail_url.startswith(settings.MEDIA_URL))
+        response = self.authorized_client.get(INDEX_URL)
+        self.assertContains(response, f'src="{post.thumbnail_url}"')
+
+    @override_settings(THUMBNAIL_ASYNC=True)
+    def test_request_does_not_resize(self):
+        """Запрос не ждёт миниатюру: лента показывает исходную картинку"""
+        post = self.create_post()
+        self.assertEqual(post.thumbnail_url, '')
+        response = self.authorized_client.get(INDEX_URL)
+        self.assertContains(response, f'src="{post.image.url}"')
+
+    def test_generate_skips_posts_without_image(self):
+        """Для записи без картинки миниатюра не создаётся"""
+        post = Post.objects.create(text='No image', author=self.user)
+        self.assertIsNone(generate(post.pk))
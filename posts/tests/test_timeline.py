@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from posts.models import Follow, Post, TimelineEntry, User
+
+
+FOLLOW_INDEX = reverse('follow_index')
+
+
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='writer')
+        cls.other = User.objects.create(username='other')
+        for i in range(3):
+            Post.objects.create(text=f'Old text:{i}', author=cls.author)
+        Post.objects.create(text='Other text', author=cls.other)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(TimelineTest.user)
+
+    def follow(self):
+        self.authorized_client.get(
+            reverse('profile_follow', kwargs={'username': 'writer'})
+        )
+
+    def test_follow_backfills_timeline(self):
+        """Подписка добавляет в ленту уже опубликованные записи автора"""
+        self.follow()
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=TimelineTest.user).count(), 3
+        )
+
+    def test_new_post_fans_out(self):
+        """Новая запись попадает в ленты подписчиков"""
+        self.follow()
+        post = Post.objects.create(text='Fresh text', author=self.author)
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=TimelineTest.user, post=post
+        ).exists())
+        response = self.authorized_client.get(FOLLOW_INDEX)
+        self.assertEqual(response.context['page'][0], post)
+        self.assertNotContains(response, 'Other text')
+
+    def test_unfollow_prunes_timeline(self):
+        """Отписка удаляет записи автора из ленты"""
+        self.follow()
+        self.authorized_client.get(
+            reverse('profile_unfollow', kwargs={'username': 'writer'})
+        )
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=TimelineTest.user).exists()
+        )
+
+    def test_rebuild_timelines_command(self):
+        """Команда rebuild_timelines восстанавливает ленты"""
+        Follow.objects.create(user=self.user, author=self.other)
+        TimelineEntry.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=TimelineTest.user).count(), 1
+        )
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Comment, Follow, Post, TrendingDecay, User
+
+
+@override_settings(
+    TRENDING_COMMENT_WEIGHT=1.0,
+    TRENDING_FOLLOWER_WEIGHT=0.5,
+    TRENDING_HALF_LIFE=60 * 60,
+    TRENDING_DECAY_INTERVAL=60 * 60,
+    TRENDING_MIN_SCORE=0.01,
+)
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='reader')
+        cls.author = User.objects.create(username='writer')
+        cls.quiet = Post.objects.create(text='Тихая запись', author=cls.user)
+        cls.hot = Post.objects.create(text='Горячая запись', author=cls.user)
+        cls.fresh = Post.objects.create(text='Свежая запись', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(TrendingTest.user)
+
+    def score(self, post):
+        return Post.objects.get(pk=post.pk).score
+
+    def comment(self, post, count=1):
+        for _ in range(count):
+            Comment.objects.create(
+                post=post, author=TrendingTest.user, text='comment'
+            )
+
+    def test_comment_raises_score(self):
+        """Каждый комментарий прибавляет вес к счёту записи"""
+        self.comment(TrendingTest.hot, 3)
+        self.assertEqual(self.score(TrendingTest.hot), 3.0)
+        self.assertEqual(self.score(TrendingTest.quiet), 0)
+
+    def test_new_follower_raises_author_posts(self):
+        """Новый подписчик поднимает свежие записи автора"""
+        Post.objects.filter(pk=TrendingTest.quiet.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        Follow.objects.create(
+            user=TrendingTest.author, author=TrendingTest.user
+        )
+        self.assertEqual(self.score(TrendingTest.hot), 0.5)
+        self.assertEqual(self.score(TrendingTest.quiet), 0)
+
+    def test_follow_cycles_do_not_inflate(self):
+        """Отписка снимает вклад подписки, повторы счёт не накручивают"""
+        for _ in range(3):
+            Follow.objects.follow(TrendingTest.author, TrendingTest.user)
+            Follow.objects.unfollow(TrendingTest.author, TrendingTest.user)
+        self.assertAlmostEqual(self.score(TrendingTest.hot), 0, places=3)
+        Follow.objects.follow(TrendingTest.author, TrendingTest.user)
+        self.assertAlmostEqual(self.score(TrendingTest.hot), 0.5, places=3)
+
+    def test_unfollow_keeps_newer_posts(self):
+        """Отписка не трогает записи, вышедшие после подписки"""
+        Follow.objects.create(
+            user=TrendingTest.author, author=TrendingTest.user,
+            created=timezone.now() - timedelta(hours=1),
+        )
+        Post.objects.filter(pk=TrendingTest.hot.pk).update(score=0.75)
+        Follow.objects.unfollow(TrendingTest.author, TrendingTest.user)
+        self.assertEqual(self.score(TrendingTest.hot), 0.75)
+
+    def test_decay_halves_per_half_life(self):
+        """За период полураспада счёт уменьшается вдвое, мелкий — обнуляется"""
+        self.comment(TrendingTest.hot, 4)
+        Post.objects.filter(pk=TrendingTest.fresh.pk).update(score=0.015)
+        factor = trending.decay()
+        self.assertAlmostEqual(factor, 0.5)
+        self.assertAlmostEqual(self.score(TrendingTest.hot), 2.0)
+        self.assertEqual(self.score(TrendingTest.fresh), 0)
+        trending.decay(timezone.now() + timedelta(hours=2))
+        self.assertAlmostEqual(self.score(TrendingTest.hot), 0.5, places=2)
+
+    def test_decay_time_kept_in_database(self):
+        """Время затухания хранится в базе и переживает очистку кэша"""
+        self.comment(TrendingTest.hot, 4)
+        now = timezone.now()
+        trending.decay(now)
+        cache.clear()
+        factor = trending.decay(now + timedelta(minutes=30))
+        self.assertAlmostEqual(factor, 0.5 ** 0.5)
+        self.assertEqual(
+            TrendingDecay.objects.get().decayed, now + timedelta(minutes=30)
+        )
+
+    def test_rebuild_from_comments(self):
+        """decay_trending --rebuild пересчитывает счета по комментариям"""
+        self.comment(TrendingTest.hot, 2)
+        Post.objects.update(score=100)
+        call_command('decay_trending', rebuild=True, stdout=StringIO())
+        self.assertAlmostEqual(self.score(TrendingTest.hot), 2.0, places=2)
+        self.assertEqual(self.score(TrendingTest.quiet), 0)
+
+    def test_rebuild_matches_follows(self):
+        """--rebuild учитывает подписки так же, как сигналы"""
+        Post.objects.filter(pk=TrendingTest.quiet.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        Follow.objects.follow(TrendingTest.author, TrendingTest.user)
+        Follow.objects.follow(TrendingTest.user, TrendingTest.author)
+        expected = {
+            post.pk: post.score
+            for post in Post.objects.only('score')
+        }
+        trending.rebuild()
+        for post in Post.objects.only('score'):
+            self.assertAlmostEqual(post.score, expected[post.pk], places=3)
+        self.assertAlmostEqual(self.score(TrendingTest.fresh), 0.5, places=3)
+
+    def test_popular_page(self):
+        """Вкладка «Популярное» показывает записи по убыванию счёта"""
+        self.comment(TrendingTest.hot, 2)
+        self.comment(TrendingTest.fresh)
+        response = self.authorized_client.get(reverse('popular'))
+        self.assertEqual(
+            list(response.context['page']),
+            [Post.objects.get(pk=TrendingTest.hot.pk),
+             Post.objects.get(pk=TrendingTest.fresh.pk)],
+        )
+        self.assertContains(response, reverse('popular'))
+        self.assertNotContains(response, 'Тихая запись')
+
+    def test_popular_page_updates(self):
+        """Новый комментарий сразу меняет закэшированный топ"""
+        self.authorized_client.get(reverse('popular'))
+        self.comment(TrendingTest.quiet)
+        response = self.authorized_client.get(reverse('popular'))
+        self.assertContains(response, 'Тихая запись')
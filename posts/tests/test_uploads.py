@@ -0,0 +1,109 @@
+import shutil
+import struct
+import tempfile
+import tracemalloc
+import zlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from posts.forms import PostForm
+from posts.models import Post, User
+from posts.thumbnails import generate
+from posts.uploadhandlers import BoundedTemporaryFileUploadHandler
+
+
+MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+# Проверка заголовка не должна выделять больше этого объёма памяти.
+MAX_VALIDATION_MEMORY = 1024 * 1024
+
+
+def png_chunk(kind, data):
+    crc = zlib.crc32(kind + data) & 0xffffffff
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', crc)
+
+
+def png_header_only(width, height):
+    """PNG, заголовок которого обещает width×height, а данных почти нет."""
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + png_chunk(b'IDAT', zlib.compress(b'\x00' * 16))
+        + png_chunk(b'IEND', b'')
+    )
+
+
+def jpeg_file(size):
+    buffer = BytesIO()
+    Image.new('RGB', size, (0, 128, 255)).save(buffer, 'jpeg')
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageUploadTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='testuser')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_oversize_dimensions_rejected_from_header(self):
+        """Слишком большая картинка отклоняется по заголовку, без декодирования"""
+        upload = SimpleUploadedFile(
+            'huge.png', png_header_only(6000, 6000), 'image/png'
+        )
+        tracemalloc.start()
+        try:
+            form = PostForm({'text': 'text'}, {'image': upload})
+            valid = form.is_valid()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertFalse(valid)
+        self.assertIn('6000×6000', form.errors['image'][0])
+        self.assertLess(
+            peak, MAX_VALIDATION_MEMORY,
+            f'Проверка 6000×6000 заняла {peak} байт памяти'
+        )
+
+    @override_settings(POSTS_IMAGE_MAX_BYTES=1024)
+    def test_oversize_file_rejected(self):
+        """Файл больше POSTS_IMAGE_MAX_BYTES отклоняется"""
+        upload = SimpleUploadedFile(
+            'big.jpg', jpeg_file((300, 300)), 'image/jpeg'
+        )
+        form = PostForm({'text': 'text'}, {'image': upload})
+        self.assertFalse(form.is_valid())
+        self.assertIn('слишком большой', form.errors['image'][0])
+
+    @override_settings(POSTS_IMAGE_MAX_BYTES=1024)
+    def test_upload_handler_stops_writing_at_limit(self):
+        """Обработчик загрузки пишет на диск не больше лимита"""
+        handler = BoundedTemporaryFileUploadHandler()
+        handler.new_file('image', 'big.jpg', 'image/jpeg', 4096)
+        for start in range(0, 4096, 512):
+            handler.receive_data_chunk(b'x' * 512, start)
+        upload = handler.file_complete(4096)
+        self.assertEqual(upload.size, 4096)
+        self.assertEqual(len(upload.read()), 1024)
+        upload.close()
+
+    @override_settings(POSTS_IMAGE_MAX_SIDE=500)
+    def test_worker_downscales_large_image(self):
+        """Фоновый обработчик уменьшает и перекодирует большую картинку"""
+        post = Post.objects.create(text='text', author=self.user)
+        post.image.save('large.jpg', ContentFile(jpeg_file((2000, 1000))))
+        self.assertTrue(generate(post.pk))
+        post.refresh_from_db()
+        with Image.open(post.image.path) as image:
+            self.assertEqual(image.size, (500, 250))
+            self.assertEqual(image.format, 'JPEG')
+        self.assertTrue(post.thumbnail_url)
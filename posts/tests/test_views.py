@@ -221,6 +221,20 @@ class PostViewTest(TestCase):
         self.assertEqual(len(response.context.get('page').object_list), 5)
 
     def test_cache_index_page(self):
+        """Фрагмент ленты берётся из кэша, пока записи не менялись"""
+        cache.clear()
+        self.guest_client.get(INDEX_URL)
+        Post.objects.filter(pk=PostViewTest.post.pk).update(
+            text='Test cache text'
+        )
+        response = self.guest_client.get(INDEX_URL)
+        self.assertNotContains(response, 'Test cache text')
+        cache.clear()
+        response_2 = self.guest_client.get(INDEX_URL)
+        self.assertContains(response_2, 'Test cache text')
+
+    def test_cache_invalidated_on_new_post(self):
+        """Новая запись сразу сбрасывает кэш ленты"""
         self.guest_client.get(INDEX_URL)
         Post.objects.create(
                 title='Test title',
@@ -229,7 +243,12 @@ class PostViewTest(TestCase):
                 group=PostViewTest.group,
         )
         response = self.guest_client.get(INDEX_URL)
-        self.assertNotContains(response, 'Test cache text')
+        self.assertContains(response, 'Test cache text')
+
+    def test_cache_varies_on_page(self):
+        """Разные страницы ленты кэшируются отдельно"""
         cache.clear()
-        response_2 = self.guest_client.get(INDEX_URL)
-        self.assertContains(response_2, 'Test cache text')
+        self.guest_client.get(INDEX_URL)
+        response = self.guest_client.get(INDEX_URL + '?page=2')
+        self.assertContains(response, 'Test text:2')
+        self.assertNotContains(response, 'Test text:9')
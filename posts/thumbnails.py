@@ -0,0 +1,68 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from sorl.thumbnail import get_thumbnail
+
+from . import feed_cache, images
+from .models import Post
+
+
+GEOMETRY = '960x339'
+OPTIONS = {'crop': 'center', 'upscale': True}
+
+logger = logging.getLogger(__name__)
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            thread_name_prefix='thumbnails',
+        )
+    return _executor
+
+
+def generate(post_id):
+    """
+    Уменьшает слишком большую картинку, готовит миниатюру для карточки
+    записи и сохраняет её адрес.
+    """
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return None
+    shrunk = images.shrink(post.image)
+    if shrunk:
+        old_name, post.image.name = post.image.name, shrunk
+        Post.objects.filter(pk=post_id, image=old_name).update(image=shrunk)
+    thumbnail = get_thumbnail(post.image, GEOMETRY, **OPTIONS)
+    Post.objects.filter(pk=post_id, image=post.image.name).update(
+        thumbnail_url=thumbnail.url
+    )
+    feed_cache.bump_generation()
+    return thumbnail.url
+
+
+def _run(post_id):
+    close_old_connections()
+    try:
+        generate(post_id)
+    except Exception:
+        logger.exception('Не удалось подготовить миниатюру записи %s', post_id)
+    finally:
+        connection.close()
+
+
+def schedule(post_id):
+    """
+    Ставит генерацию миниатюры в пул потоков после коммита транзакции.
+    При THUMBNAIL_ASYNC = False (так в yatube.settings_test) миниатюра
+    готовится сразу.
+    """
+    if not settings.THUMBNAIL_ASYNC:
+        generate(post_id)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run, post_id))
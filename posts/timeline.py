@@ -0,0 +1,89 @@
+from django.db.models import F
+
+from .models import Follow, Post, TimelineEntry
+
+
+BATCH_SIZE = 500
+# Сортировка ленты для CursorPaginator: по дате из TimelineEntry.
+ORDERING = ('-timeline_date', '-pk')
+
+
+def feed(user_id):
+    """
+    Записи ленты подписок в порядке индекса (user, -pub_date) таблицы
+    TimelineEntry: сортировка по дате самой записи заставила бы SQLite
+    сортировать все строки ленты во временном B-дереве.
+    """
+    return Post.objects.for_feed().filter(
+        timeline_entries__user=user_id
+    ).annotate(
+        timeline_date=F('timeline_entries__pub_date')
+    ).order_by('-timeline_date')
+
+
+def fan_out_post(post):
+    """Раскладывает новую запись в ленты всех подписчиков автора."""
+    fan_out_posts([post])
+
+
+def fan_out_posts(posts):
+    """То же для пачки записей: подписчики читаются раз на автора."""
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    for author_id, author_posts in by_author.items():
+        followers = list(Follow.objects.filter(
+            author=author_id
+        ).values_list('user_id', flat=True))
+        TimelineEntry.objects.bulk_create(
+            (
+                TimelineEntry(
+                    user_id=user_id,
+                    post_id=post.id,
+                    author_id=author_id,
+                    pub_date=post.pub_date,
+                )
+                for user_id in followers
+                for post in author_posts
+            ),
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def backfill(user_id, author_id):
+    """Добавляет в ленту подписчика все записи автора."""
+    posts = Post.objects.filter(
+        author=author_id
+    ).values_list('id', 'pub_date')
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                user_id=user_id,
+                post_id=post_id,
+                author_id=author_id,
+                pub_date=pub_date,
+            )
+            for post_id, pub_date in posts.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def prune(user_id, author_id):
+    TimelineEntry.objects.filter(user=user_id, author=author_id).delete()
+
+
+def rebuild(user_ids=None):
+    follows = Follow.objects.all()
+    entries = TimelineEntry.objects.all()
+    if user_ids is not None:
+        follows = follows.filter(user__in=user_ids)
+        entries = entries.filter(user__in=user_ids)
+    entries.delete()
+    count = 0
+    for user_id, author_id in follows.values_list('user_id', 'author_id'):
+        backfill(user_id, author_id)
+        count += 1
+    return count
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import feed_cache
+from .models import Comment, Post, TrendingDecay
+
+
+SCOPE = 'trending'
+
+
+def _weight(age):
+    """Вклад события возрастом age секунд: вдвое меньше за каждый период."""
+    return 0.5 ** (max(age, 0) / settings.TRENDING_HALF_LIFE)
+
+
+def add_score(posts, amount):
+    """Прибавляет amount к счёту записей одним UPDATE с F()."""
+    updated = posts.update(score=F('score') + amount)
+    if updated:
+        feed_cache.bump_generation(SCOPE)
+    return updated
+
+
+def comment_added(post_id, count=1):
+    return add_score(
+        Post.objects.filter(pk=post_id),
+        settings.TRENDING_COMMENT_WEIGHT * count,
+    )
+
+
+def _window():
+    return timedelta(seconds=settings.TRENDING_WINDOW)
+
+
+def _followed_posts(follow):
+    """Записи, которые подписка follow подняла: свежие на момент подписки."""
+    return Post.objects.filter(
+        author_id=follow.author_id,
+        pub_date__gte=follow.created - _window(),
+        pub_date__lte=follow.created,
+    )
+
+
+def follower_added(follow):
+    """Новый подписчик поднимает свежие записи автора."""
+    return add_score(
+        _followed_posts(follow), settings.TRENDING_FOLLOWER_WEIGHT
+    )
+
+
+def follower_removed(follow, now=None):
+    """
+    Отписка снимает вклад подписки с тех же записей — с учётом
+    затухания с момента подписки, так что повторные подписки и отписки
+    счёт не накручивают. Ниже нуля счёт не опускается.
+    """
+    now = now or timezone.now()
+    amount = settings.TRENDING_FOLLOWER_WEIGHT * _weight(
+        (now - follow.created).total_seconds()
+    )
+    updated = _followed_posts(follow).filter(score__gt=0).update(
+        score=Greatest(F('score') - amount, 0)
+    )
+    if updated:
+        feed_cache.bump_generation(SCOPE)
+    return updated
+
+
+def _last_decay():
+    return TrendingDecay.objects.filter(pk=1).values_list(
+        'decayed', flat=True
+    ).first()
+
+
+def _mark_decayed(now):
+    # Время в базе, а не в кэше: у LocMemCache каждый запуск команды
+    # начинал бы с пустого кэша.
+    TrendingDecay.objects.update_or_create(pk=1, defaults={'decayed': now})
+
+
+def decay(now=None):
+    """
+    Уменьшает все счета пропорционально времени с прошлого затухания
+    (если оно неизвестно — TRENDING_DECAY_INTERVAL); слишком малые
+    обнуляются, чтобы не попадать в топ. Возвращает множитель.
+    """
+    now = now or timezone.now()
+    last = _last_decay()
+    if last is None:
+        elapsed = settings.TRENDING_DECAY_INTERVAL
+    else:
+        elapsed = (now - last).total_seconds()
+    factor = _weight(elapsed)
+    with transaction.atomic():
+        Post.objects.filter(score__gt=0).update(score=F('score') * factor)
+        Post.objects.filter(
+            score__gt=0, score__lt=settings.TRENDING_MIN_SCORE
+        ).update(score=0)
+        _mark_decayed(now)
+    feed_cache.bump_generation(SCOPE)
+    return factor
+
+
+def rebuild(now=None):
+    """
+    Пересчитывает счета с нуля по комментариям и подпискам за
+    TRENDING_WINDOW — так же, как их начисляют сигналы. Возвращает
+    число записей в топе.
+    """
+    now = now or timezone.now()
+    since = now - _window()
+    scores = defaultdict(float)
+    comments = Comment.objects.filter(created__gte=since).values_list(
+        'post_id', 'created'
+    )
+    for post_id, created in comments.iterator():
+        scores[post_id] += settings.TRENDING_COMMENT_WEIGHT * _weight(
+            (now - created).total_seconds()
+        )
+    follows = Post.objects.filter(
+        author__following__created__gte=since,
+        pub_date__gte=F('author__following__created') - _window(),
+        pub_date__lte=F('author__following__created'),
+    ).values_list('pk', 'author__following__created')
+    for post_id, followed in follows.iterator():
+        scores[post_id] += settings.TRENDING_FOLLOWER_WEIGHT * _weight(
+            (now - followed).total_seconds()
+        )
+    with transaction.atomic():
+        Post.objects.filter(score__gt=0).update(score=0)
+        for post_id, score in scores.items():
+            Post.objects.filter(pk=post_id).update(score=score)
+        _mark_decayed(now)
+    feed_cache.bump_generation(SCOPE)
+    return len(scores)
+
+
+def top():
+    """Топ TRENDING_SIZE записей по индексу (-score, -id)."""
+    return Post.objects.for_feed().filter(
+        score__gt=0
+    ).order_by('-score', '-id')[:settings.TRENDING_SIZE]
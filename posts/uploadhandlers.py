@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Пишет загрузку на диск кусками, но не больше POSTS_IMAGE_MAX_BYTES:
+    остаток отбрасывается, а size сохраняет настоящий размер, чтобы
+    форма отклонила файл, не читая его.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.written = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        room = settings.POSTS_IMAGE_MAX_BYTES - self.written
+        if room > 0:
+            chunk = raw_data[:room]
+            self.file.write(chunk)
+            self.written += len(chunk)
@@ -1,18 +1,36 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 urlpatterns = [
     path("", views.index, name="index"),
     path("group/<slug:slug>/", views.group_post, name="group"),
     path("new/", views.new_post, name="new"),
     path("follow/", views.follow_index, name="follow_index"),
+    path("popular/", views.popular, name="popular"),
+    path("search/", views.search, name="search"),
+    path("feeds/atom/", feeds.index_atom, name="index_atom"),
+    path("feeds/json/", feeds.index_json, name="index_json"),
+    path("group/<slug:slug>/atom/", feeds.group_atom, name="group_atom"),
+    path("group/<slug:slug>/json/", feeds.group_json, name="group_json"),
     path('<str:username>/', views.profile, name='profile'),
     path('<str:username>/<int:post_id>/', views.post_view, name='post'),
     path('<str:username>/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path("<username>/<int:post_id>/comment/", views.add_comment, name="add_comment"),
+    path(
+        "<str:username>/<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
+    path("<str:username>/atom/", feeds.profile_atom, name="profile_atom"),
+    path("<str:username>/json/", feeds.profile_json, name="profile_json"),
     path("<str:username>/follow/", views.profile_follow, name="profile_follow"), 
-    path("<str:username>/unfollow/", views.profile_unfollow, name="profile_unfollow"),    
+    path("<str:username>/unfollow/", views.profile_unfollow, name="profile_unfollow"),
+    path(
+        "<str:username>/subscription/",
+        views.profile_subscription,
+        name="profile_subscription",
+    ),    
     path('404/', views.page_not_found, name='404'),
     path('500/', views.server_error, name='500'),
 ]
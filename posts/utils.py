@@ -0,0 +1,5 @@
+def percentile(values, percent):
+    """Значение из values, ниже которого percent процентов (без интерполяции)."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
@@ -1,42 +1,78 @@
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_http_methods
 
+from . import timeline
 from .models import Comment, Post, Group, User, Follow
 from .forms import PostForm, CommentForm
+from .authors import author_context, get_author_or_404
+from .conditional import conditional_page
+from .feed_cache import feed_cache_context
+from .pagination import CursorPaginator, page_of, paginate
+from .replicas import pin_to_primary, read_from_replica
+from .search import search_ids
+from .stats import get_stats
+from .streaming import render_feed
+from .trending import top
 
 
+@read_from_replica
+@conditional_page
 def index(request):
-    post_list = Post.objects.select_related('group')
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(
+    post_list = Post.objects.for_feed()
+    page, paginator = paginate(
+        request, post_list, lazy=settings.FEED_STREAMING
+    )
+    return render_feed(
          request,
          'index.html',
          {
             'page': page,
             'paginator': paginator,
+            **feed_cache_context(request, 'index'),
          }
      ) 
 
+@read_from_replica
+@conditional_page
 def group_post(request, slug):
     group = get_object_or_404(Group, slug=slug) 
-    post_list = Post.objects.filter(group=group).all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(
+    post_list = Post.objects.for_feed().filter(group=group)
+    page, paginator = paginate(
+        request, post_list, lazy=settings.FEED_STREAMING
+    )
+    return render_feed(
         request, 
         "group.html", 
         {
             "group": group,
             'page': page,
-            'paginator': paginator
+            'paginator': paginator,
+            **feed_cache_context(request, 'group', group.id),
         }
         )
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    paginator = Paginator(search_ids(query) if query else [], 10)
+    page = paginator.get_page(request.GET.get('page'))
+    posts = Post.objects.for_feed().in_bulk(page.object_list)
+    page.object_list = [posts[pk] for pk in page.object_list if pk in posts]
+    return render(
+        request,
+        'search.html',
+        {
+            'query': query,
+            'page': page,
+            'paginator': paginator,
+        }
+    )
+
 @login_required
+@pin_to_primary
 def new_post(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
     if request.method == "POST":
@@ -49,51 +85,65 @@ def new_post(request):
     form = PostForm()
     return render(request, "new.html", {"form": form})
     
+@read_from_replica
+@conditional_page
 def profile(request, username):
-    profile = get_object_or_404(User, username=username)
-    post_list = Post.objects.filter(author=profile).all()
-    post_count = post_list.count()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
-    followers = Follow.objects.filter(author=profile.id).count()
-    follows = Follow.objects.filter(user=profile.id).count()
-    following = Follow.objects.filter(user=request.user.id, author=profile.id).all()
+    author = get_author_or_404(request, username)
+    post_list = Post.objects.for_feed().filter(author=author['profile'])
+    page, paginator = paginate(
+        request, post_list, lazy=settings.FEED_STREAMING
+    )
     context = {
-        'profile': profile,
-        'post_count': post_count,
+        **author,
         'page': page,
         'paginator': paginator,
-        "followers": followers,
-        "follows": follows, 
-        "following": following,
+        **feed_cache_context(request, 'profile', author['profile'].id),
     }
-    return render(request, 'profile.html', context)
+    return render_feed(request, 'profile.html', context)
  
  
+@read_from_replica
+@conditional_page
 def post_view(request, username, post_id):
-    profile = get_object_or_404(User, username=username)
-    post = get_object_or_404(Post, pk=post_id)
-    post_list = Post.objects.filter(author=profile).all()
-    post_count = post_list.count()
-    form = CommentForm()
-    comments = Comment.objects.filter(post=post).all() 
-    followers = Follow.objects.filter(author=profile.id).count()
-    follows = Follow.objects.filter(user=profile.id).count()
-    following = Follow.objects.filter(user=request.user.id, author=profile.id).all()
+    post = get_object_or_404(
+        Post.objects.for_feed(), author__username=username, pk=post_id
+    )
+    comments = Comment.objects.filter(post=post).select_related('author')
+    page = comments_page(comments, request.GET.get('comments'))
     context = {
-        'profile': profile,
+        **author_context(request, post.author),
         'post': post,
-        'post_count': post_count,
-        'comments': comments,
-        'form': form,
-        "followers": followers,
-        "follows": follows, 
-        "following": following, 
-    }   
+        # Только записи этой страницы: шаблон читает comments_page,
+        # а ленивый срез ничего не запрашивает и не тянет всю таблицу.
+        'comments': comments.filter(pk__in=[item.pk for item in page]),
+        'comments_page': page,
+        'form': CommentForm(),
+    }
     return render(request, 'post.html', context)
 
+def comments_page(comments, cursor=None):
+    """Страница комментариев от новых к старым, по курсору (created, id)."""
+    paginator = CursorPaginator(
+        comments, settings.COMMENTS_PER_PAGE, ordering=('-created', '-pk')
+    )
+    return paginator.get_page(cursor)
+
+
+def post_comments(request, username, post_id):
+    """Фрагмент со следующей пачкой комментариев для подгрузки."""
+    post = get_object_or_404(
+        Post.objects.select_related('author').only('pk', 'author__username'),
+        pk=post_id,
+        author__username=username,
+    )
+    comments = Comment.objects.filter(post=post).select_related('author')
+    return render(request, 'comment_list.html', {
+        'post': post,
+        'comments_page': comments_page(comments, request.GET.get('cursor')),
+    })
+
 @login_required
+@pin_to_primary
 def post_edit(request, username, post_id):
     user = get_object_or_404(User, username=username)
     post = get_object_or_404(Post, pk=post_id)
@@ -111,6 +161,7 @@ def post_edit(request, username, post_id):
     return render(request, 'post_new.html', {'form': form, 'post': post})
 
 @login_required
+@pin_to_primary
 def add_comment(request, username, post_id):
     user = get_object_or_404(User, username=username)
     post = get_object_or_404(Post, id=post_id)
@@ -126,35 +177,77 @@ def add_comment(request, username, post_id):
     return redirect("post", username=request.user.username, post_id=post_id)
 
 @login_required
+@read_from_replica
+@conditional_page
 def follow_index(request):
-    following = Follow.objects.filter(user=request.user).all()
-    author_list = []
-    for author in following:
-        author_list.append(author.author.id)
-    post_list = Post.objects.filter(author__in=author_list).all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get("page")
-    page = paginator.get_page(page_number)
-    return render(request, "follow.html", {"page": page, "paginator": paginator})
+    page, paginator = paginate(
+        request,
+        timeline.feed(request.user.id),
+        ordering=timeline.ORDERING,
+        lazy=settings.FEED_STREAMING,
+    )
+    return render_feed(
+        request,
+        "follow.html",
+        {
+            "page": page,
+            "paginator": paginator,
+            **feed_cache_context(
+                request, 'follow', scopes=[f'user:{request.user.id}']
+            ),
+        }
+    )
+
+@read_from_replica
+def popular(request):
+    """Популярные записи: топ по счёту, без агрегации комментариев."""
+    paginator = Paginator(top(), settings.POSTS_PER_PAGE)
+    page = page_of(
+        paginator, request.GET.get('page'), lazy=settings.FEED_STREAMING
+    )
+    return render_feed(
+        request,
+        'popular.html',
+        {
+            'page': page,
+            'paginator': paginator,
+            **feed_cache_context(request, 'popular', scopes=['trending']),
+        }
+    )
 
 @login_required
+@pin_to_primary
 def profile_follow(request, username):
-    user = request.user
     author = get_object_or_404(User, username=username)
-    follow_check = Follow.objects.filter(user=user.id, author=author.id).count()
-    if follow_check == 0 and author.id != user.id:
-        Follow.objects.create(user=request.user, author=author)
+    Follow.objects.follow(request.user, author)
     return redirect("profile", username=username)
 
 @login_required
+@pin_to_primary
 def profile_unfollow(request, username):
-    user = request.user.id
     author = get_object_or_404(User, username=username)
-    follow_check = Follow.objects.filter(user=user, author=author.id).count()
-    if follow_check == 1:
-        Follow.objects.filter(user=request.user, author=author).delete()
+    Follow.objects.unfollow(request.user, author)
     return redirect("profile", username=username)
 
+@require_http_methods(["POST", "DELETE"])
+@pin_to_primary
+def profile_subscription(request, username):
+    """POST — подписаться, DELETE — отписаться; ответ в JSON."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "authentication required"}, status=401)
+    author = get_object_or_404(User, username=username)
+    if request.method == "POST":
+        Follow.objects.follow(request.user, author)
+        following = author != request.user
+    else:
+        Follow.objects.unfollow(request.user, author)
+        following = False
+    return JsonResponse({
+        "username": author.username,
+        "following": following,
+        "followers": get_stats(author.id).followers_count,
+    })
+
 def page_not_found(request, exception):
     return render(
         request, 
@@ -16,7 +16,7 @@ ALLOWED_HOSTS = [
 
 
 INSTALLED_APPS = [
-    'posts',
+    'posts.apps.PostsConfig',
     'users',
     'about',
     'django.contrib.admin',
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'posts.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,6 +67,31 @@ DATABASES = {
     }
 }
 
+# Реплика для чтения лент (posts/replicas.py). Локально это копия
+# основного файла: YATUBE_REPLICA_DB=replica.sqlite3.
+REPLICA_DATABASE = 'replica'
+REPLICA_PIN_SECONDS = 5
+
+if os.environ.get('YATUBE_REPLICA_DB'):
+    DATABASES[REPLICA_DATABASE] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['YATUBE_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['posts.replicas.ReplicaRouter']
+
+# PRAGMA для каждого нового соединения с SQLite (posts/db.py).
+SQLITE_PRAGMAS = {}
+
+SQLITE_TUNED_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -83,12 +109,36 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# locmem — кэш в памяти процесса; file и db (таблица в SQLite, нужен
+# manage.py createcachetable) — общий кэш для нескольких воркеров.
+CACHE_BACKENDS = {
+    'locmem': ('posts.cache_backends.LocMemCache', ''),
+    'file': (
+        'posts.cache_backends.FileBasedCache',
+        os.path.join(BASE_DIR, 'cache'),
+    ),
+    'db': ('posts.cache_backends.DatabaseCache', 'yatube_cache'),
+}
+
+CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[
+    os.environ.get('YATUBE_CACHE', 'locmem')
+]
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('YATUBE_CACHE_LOCATION', CACHE_LOCATION),
     }
 }
 
+CACHE_STATS_FLUSH_EVERY = 100
+
+# Поколения кэша лент (posts/feed_cache.py) видны всем воркерам только
+# в общем кэше. С locmem у каждого процесса свои счётчики, поэтому
+# ETag и Last-Modified не выдаются: воркер, не видевший изменения,
+# отвечал бы 304 на устаревшую страницу.
+FEED_CACHE_SHARED = CACHE_BACKEND != CACHE_BACKENDS['locmem'][0]
+
 
 
 LANGUAGE_CODE = "ru"
@@ -118,3 +168,81 @@ LOGIN_REDIRECT_URL = "index"
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+
+POSTS_PER_PAGE = 10
+
+COMMENTS_PER_PAGE = 20
+
+POSTS_CURSOR_PAGINATION = os.environ.get('POSTS_CURSOR_PAGINATION') == '1'
+
+FEED_CACHE_TIMEOUT = 60 * 5
+
+AUTHOR_CONTEXT_TIMEOUT = 30
+
+# Популярное (posts/trending.py): вес событий, период полураспада счёта,
+# окно свежих записей автора для новых подписчиков и размер топа.
+TRENDING_COMMENT_WEIGHT = 1.0
+
+TRENDING_FOLLOWER_WEIGHT = 0.5
+
+TRENDING_HALF_LIFE = 24 * 60 * 60
+
+TRENDING_DECAY_INTERVAL = 60 * 60
+
+TRENDING_WINDOW = 7 * 24 * 60 * 60
+
+TRENDING_MIN_SCORE = 0.01
+
+TRENDING_SIZE = 50
+
+SYNDICATION_ITEMS = 20
+
+API_PAGE_SIZE = 20
+
+API_MAX_PAGE_SIZE = 100
+
+API_MAX_BATCH = 100
+
+FEED_STREAMING = os.environ.get('YATUBE_STREAMING') == '1'
+
+SEARCH_MAX_TERMS = 8
+
+SEARCH_MAX_RESULTS = 500
+
+THUMBNAIL_ASYNC = True
+
+THUMBNAIL_WORKERS = 2
+
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'posts.uploadhandlers.BoundedTemporaryFileUploadHandler',
+]
+
+POSTS_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+
+POSTS_IMAGE_MAX_PIXELS = 25 * 1000 * 1000
+
+POSTS_IMAGE_MAX_SIDE = 2560
+
+PERF_INSTRUMENTATION = os.environ.get('YATUBE_PERF') == '1'
+
+PERF_SAMPLE_RATE = float(os.environ.get('YATUBE_PERF_SAMPLE_RATE', '0.1'))
+
+PERF_SAMPLES_PATH = os.path.join(BASE_DIR, 'perf.sqlite3')
+
+PERF_SLOW_QUERIES = 3
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'posts.perf': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
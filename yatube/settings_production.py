@@ -0,0 +1,24 @@
+"""
+Профиль для боевого запуска:
+DJANGO_SETTINGS_MODULE=yatube.settings_production.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, SECRET_KEY, SQLITE_TUNED_PRAGMAS
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('YATUBE_SECRET_KEY', SECRET_KEY)
+
+ALLOWED_HOSTS = os.environ.get('YATUBE_ALLOWED_HOSTS', 'localhost').split(',')
+
+# Постоянные соединения: не открывать SQLite и не применять PRAGMA
+# заново на каждый запрос.
+DATABASES['default']['CONN_MAX_AGE'] = int(
+    os.environ.get('YATUBE_CONN_MAX_AGE', 600)
+)
+
+# WAL: читатели не ждут писателя, а писатели ждут друг друга до
+# busy_timeout вместо мгновенного "database is locked".
+SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
@@ -0,0 +1,10 @@
+"""
+Профиль для тестов: DJANGO_SETTINGS_MODULE=yatube.settings_test
+(его выбирает pytest.ini; для manage.py test — --settings).
+"""
+from .settings import *  # noqa: F401,F403
+
+# Тестовая SQLite в памяти делит соединение между потоками через shared
+# cache с табличными блокировками без ожидания: миниатюра из пула
+# потоков ловила бы "database table is locked". Готовим её сразу.
+THUMBNAIL_ASYNC = False